@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+
+def accepts_encoding(accept_encoding: str | None, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows `coding` (q=0 means refused)."""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in (coding, "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
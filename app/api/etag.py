@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from uuid import UUID
+
+
+def job_etag(job_id: UUID, updated_at: datetime, status: str) -> str:
+    """Strong ETag for a job representation: changes whenever the row is written."""
+    raw = f"{job_id}:{updated_at.isoformat()}:{status}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
@@ -1,41 +1,251 @@
+import asyncio
 import json
+from datetime import datetime
+from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compression import IDENTITY, decompress
+from app.core.config import get_settings
 from app.db.deps import get_db
-from app.services.job_service import JobService
+from app.services.job_events import get_job_status_broadcaster
+from app.services.job_service import JobService, is_terminal
 from app.models.job import (
+    JobBatchCreateResponse,
     JobCreateRequest,
     JobCreateResponse,
+    JobListResponse,
+    JobStatusEvent,
     JobStatusResponse,
     JobResultResponse,
     JobStatus,
 )
+from app.api.encoding import accepts_encoding
+from app.api.etag import etag_matches, job_etag
+from app.api.pagination import decode_cursor, encode_cursor
 from app.api.mappers.job_response_mapper import (
+    to_batch_create_response,
     to_create_response,
+    to_list_response,
+    to_status_event,
     to_status_response,
-    to_result_response, 
+    to_result_response,
+    to_result_stream,
 )
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("", response_model=JobCreateResponse)
-def create_job_endpoint(payload: JobCreateRequest, db: Session = Depends(get_db)):
+async def create_job_endpoint(payload: JobCreateRequest, db: AsyncSession = Depends(get_db)):
     svc = JobService(db)
-    job = svc.create_job(payload)
-    return to_create_response(job)
+    job, deduplicated = await svc.create_job(payload)
+    return to_create_response(job, deduplicated)
 
 
-@router.get("/{job_id}", response_model=JobStatusResponse)
-def get_job_endpoint(job_id: UUID, db: Session = Depends(get_db)):
+@router.post("/batch", response_model=JobBatchCreateResponse)
+async def create_jobs_batch_endpoint(
+    payloads: Annotated[
+        list[JobCreateRequest],
+        Body(min_length=1, max_length=settings.JOB_BATCH_MAX_ITEMS),
+    ],
+    db: AsyncSession = Depends(get_db),
+):
+    """Creates up to JOB_BATCH_MAX_ITEMS jobs in one transaction."""
     svc = JobService(db)
-    job = svc.get_job(job_id)
+    return to_batch_create_response(await svc.create_jobs(payloads))
+
+
+@router.get("", response_model=JobListResponse)
+async def list_jobs_endpoint(
+    status: list[JobStatus] | None = Query(default=None),
+    tms_provider: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    svc = JobService(db)
+    jobs, next_after = await svc.list_jobs(
+        statuses=status,
+        tms_provider=tms_provider,
+        created_from=created_from,
+        created_to=created_to,
+        after=decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    return to_list_response(jobs, encode_cursor(*next_after) if next_after else None)
+
+
+async def _not_modified(svc: JobService, job_id: UUID, if_none_match: str | None) -> Response | None:
+    """304 if the client's cached copy is current, checked without reading any content."""
+    if not if_none_match:
+        return None
+    version = await svc.get_job_version(job_id)
+    etag = job_etag(version.id, version.updated_at, version.status.value)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse, responses={304: {"description": "Not modified"}})
+async def get_job_endpoint(
+    job_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    svc = JobService(db)
+    if not_modified := await _not_modified(svc, job_id, if_none_match):
+        return not_modified
+    job = await svc.get_job_status_view(job_id)
+    _set_etag(response, job_etag(job.id, job.updated_at, job.status.value))
     return to_status_response(job)
 
-@router.get("/{job_id}/result", response_model=JobResultResponse)
-def get_result_endpoint(job_id: UUID, db: Session = Depends(get_db)):
+def _parse_key_path(keys: str | None) -> list[str] | None:
+    if keys is None:
+        return None
+    key_path = keys.split(".")
+    if not all(key_path):
+        raise HTTPException(status_code=400, detail="Invalid keys path")
+    return key_path
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse, responses={304: {"description": "Not modified"}})
+async def get_result_endpoint(
+    job_id: UUID,
+    response: Response,
+    locale: list[str] | None = Query(default=None, description="Only these target locales"),
+    keys: str | None = Query(default=None, description="Only this key path in each locale, e.g. `home.hero`"),
+    stream: bool = Query(default=False, description="Stream the JSON as Postgres renders it"),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
     svc = JobService(db)
-    job = svc.get_job(job_id)
+    key_path = _parse_key_path(keys)
+    if not_modified := await _not_modified(svc, job_id, if_none_match):
+        return not_modified
+
+    if stream:
+        head, locales = await svc.stream_job_result(job_id, locales=locale, key_path=key_path)
+        streamed = StreamingResponse(to_result_stream(head, locales), media_type="application/json")
+        _set_etag(streamed, job_etag(head.id, head.updated_at, head.status.value))
+        return streamed
+
+    job = await svc.get_job_result_view(job_id, locales=locale, key_path=key_path)
+    _set_etag(response, job_etag(job.id, job.updated_at, job.status.value))
     return to_result_response(job)
+
+
+@router.get(
+    "/{job_id}/source",
+    responses={200: {"content": {"application/json": {}}}, 304: {"description": "Not modified"}},
+)
+async def get_source_endpoint(
+    job_id: UUID,
+    accept_encoding: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The submitted source content. Compressed blobs are sent as stored
+    (`Content-Encoding: zstd`) to clients that accept it.
+    """
+    svc = JobService(db)
+    blob = await svc.get_source_blob(job_id)
+    headers = {"ETag": f'"{blob.key}"', "Vary": "Accept-Encoding"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if blob.codec == IDENTITY:
+        return Response(blob.data, media_type="application/json", headers=headers)
+    if accepts_encoding(accept_encoding, blob.codec):
+        return Response(
+            blob.data,
+            media_type="application/json",
+            headers={**headers, "Content-Encoding": blob.codec},
+        )
+    data = await asyncio.to_thread(decompress, blob.codec, blob.data)
+    return Response(data, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/{job_id}/events",
+    response_model=JobStatusEvent,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def job_events_endpoint(
+    job_id: UUID,
+    request: Request,
+    wait: float | None = Query(default=None, gt=0, description="Long-poll for up to this many seconds"),
+    status: JobStatus | None = Query(default=None, description="Long-poll: the status the client already has"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Without `wait`: a server-sent event stream with one `status` event now and one per
+    change, ending after a terminal status. With `wait`: returns as soon as the status
+    differs from `status` (or changes, if omitted), else the current status on timeout.
+    """
+    svc = JobService(db)
+    broadcaster = get_job_status_broadcaster()
+
+    # Subscribe before reading, so no change can slip in between
+    queue = await broadcaster.subscribe(job_id)
+    try:
+        current = to_status_event(await svc.get_job_status_view(job_id))
+    except BaseException:
+        broadcaster.unsubscribe(job_id, queue)
+        raise
+    # Nothing else to read: give the connection back while we wait
+    await db.close()
+
+    async def next_change(last: JobStatusEvent, timeout: float) -> JobStatusEvent | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if event.updated_at > last.updated_at:
+                return event
+        return None
+
+    if wait is not None:
+        try:
+            if status is None or current.status == status:
+                current = await next_change(current, min(wait, settings.JOB_EVENTS_MAX_WAIT_SECONDS)) or current
+            return current
+        finally:
+            broadcaster.unsubscribe(job_id, queue)
+
+    async def stream():
+        last = current
+        try:
+            yield f"event: status\ndata: {last.model_dump_json()}\n\n"
+            while not is_terminal(last.status):
+                event = await next_change(last, settings.JOB_EVENTS_HEARTBEAT_SECONDS)
+                if await request.is_disconnected():
+                    return
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                last = event
+                yield f"event: status\ndata: {last.model_dump_json()}\n\n"
+        finally:
+            broadcaster.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,34 +1,57 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
+from typing import AsyncIterator
 
-from app.domain.job import JobEntity
-from app.models.job import JobCreateResponse, JobStatusResponse, JobResultResponse, JobStatus
+from app.domain.job import JobEntity, JobResultHead, JobResultView, JobStatusView
+from app.models.job import (
+    ExternalRefs,
+    JobBatchCreateResponse,
+    JobCreateResponse,
+    JobListResponse,
+    JobResultResponse,
+    JobStatus,
+    JobStatusEvent,
+    JobStatusResponse,
+)
 
 
-def to_create_response(job: JobEntity) -> JobCreateResponse:
+def to_create_response(job: JobEntity | JobStatusView, deduplicated: bool = False) -> JobCreateResponse:
     return JobCreateResponse(
         job_id=job.id,
         status=job.status,
         created_at=job.created_at or datetime.utcnow(),
+        deduplicated=deduplicated,
     )
 
 
-def to_status_response(job: JobEntity) -> JobStatusResponse:
+def to_batch_create_response(created: list[tuple[JobStatusView, bool]]) -> JobBatchCreateResponse:
+    return JobBatchCreateResponse(results=[to_create_response(job, deduplicated) for job, deduplicated in created])
+
+
+def to_status_response(job: JobEntity | JobStatusView) -> JobStatusResponse:
     return JobStatusResponse(
         job_id=job.id,
         status=job.status,
         source_locale=str(job.source_locale),
         target_locales=[str(x) for x in job.target_locales],
-        tms_provider=str(job.external.tms_provider) if job.external.tms_provider else None,
-        tms_job_id=job.external.tms_job_id,
+        external=ExternalRefs(
+            tms_provider=str(job.external.tms_provider) if job.external.tms_provider else None,
+            tms_job_id=job.external.tms_job_id,
+            tms_project_id=job.external.tms_project_id,
+        ),
         created_at=job.created_at,
         updated_at=job.updated_at,
         error=job.error,
     )
 
 
-def to_result_response(job: JobEntity) -> JobResultResponse:
+def to_status_event(job: JobEntity | JobStatusView) -> JobStatusEvent:
+    return JobStatusEvent(job_id=job.id, status=job.status, updated_at=job.updated_at)
+
+
+def to_result_response(job: JobResultView) -> JobResultResponse:
     return JobResultResponse(
         job_id=job.id,
         status=job.status,
@@ -36,3 +59,31 @@ def to_result_response(job: JobEntity) -> JobResultResponse:
         qc_report=job.qc_report,
         updated_at=job.updated_at,
     )
+
+
+async def to_result_stream(
+    head: JobResultHead, locales: AsyncIterator[tuple[str, str]]
+) -> AsyncIterator[str]:
+    """
+    The JobResultResponse JSON document, written piecewise: translated_content is
+    assembled from per-locale JSON text exactly as Postgres rendered it.
+    """
+    meta = JobResultResponse(
+        job_id=head.id, status=head.status, updated_at=head.updated_at
+    ).model_dump_json(exclude={"translated_content", "qc_report"})
+    yield f'{meta[:-1]},"qc_report":{head.qc_report_json or "null"},"translated_content":'
+    if not head.translated:
+        yield "null}"
+        return
+    separator = "{"
+    async for locale, content in locales:
+        yield f"{separator}{json.dumps(locale)}:{content}"
+        separator = ","
+    yield "{}}" if separator == "{" else "}}"
+
+
+def to_list_response(jobs: list[JobStatusView], next_cursor: str | None) -> JobListResponse:
+    return JobListResponse(
+        items=[to_status_response(j) for j in jobs],
+        next_cursor=next_cursor,
+    )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from app.api.jobs import router as jobs_router
+from app.api.translation_memory import router as translation_memory_router
 from app.api.webhooks import router as webhooks_router
 
 router = APIRouter()
 router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
 router.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
+router.include_router(translation_memory_router, prefix="/translation-memory", tags=["translation-memory"])
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.deps import get_db
+from app.models.translation_memory import TmStatsResponse
+from app.services.translation_memory import TranslationMemoryService
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=TmStatsResponse)
+async def translation_memory_stats(since: datetime | None = None, db: AsyncSession = Depends(get_db)):
+    """Translation-memory hit rate over jobs created since `since` (all jobs if omitted)."""
+    stats = await TranslationMemoryService(db).stats(since)
+    return TmStatsResponse(
+        since=since,
+        jobs=stats.jobs,
+        segments=stats.segments,
+        hits=stats.hits,
+        hit_rate=stats.hit_rate,
+    )
@@ -1,14 +1,12 @@
-import hashlib
-import json
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.db.deps import get_db
-from app.models.webhooks import TmsWebhookEvent
+from app.models.webhooks import TmsWebhookBatchResponse, TmsWebhookEvent, TmsWebhookResult
 from app.services.job_service import JobService
-from app.repos.webhook_events import try_register_webhook_event
 
 router = APIRouter()
 settings = get_settings()
@@ -21,39 +19,58 @@ def verify_webhook(x_webhook_secret: str | None) -> None:
         raise HTTPException(status_code=401, detail="Invalid webhook secret")
 
 
-def compute_idempotency_key(payload: TmsWebhookEvent) -> str:
-    # Prefer event_id if provided by TMS
-    if payload.event_id:
-        return f"{payload.provider}:{payload.event_id}"
-
-    # Fallback: stable hash of the payload content
-    body = json.dumps(payload.model_dump(), sort_keys=True, separators=(",", ":"))
-    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
-    return f"{payload.provider}:sha256:{digest}"
-
-
 @router.post("/tms")
-def tms_webhook(
+async def tms_webhook(
     payload: TmsWebhookEvent,
+    response: Response,
     x_webhook_secret: str | None = Header(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_webhook(x_webhook_secret)
 
-    key = compute_idempotency_key(payload)
-    first_time = try_register_webhook_event(
-        db,
-        key=key,
-        provider=payload.provider,
-        event=payload.event,
-        internal_job_id=payload.internal_job_id,
-    )
+    svc = JobService(db)
+    if settings.WEBHOOK_MODE == "queue":
+        await svc.enqueue_tms_webhooks([payload])
+        response.status_code = 202
+        return {"ok": True, "queued": True}
+
+    outcome = await svc.handle_tms_webhook(payload)
 
     # Duplicate webhook: return 200 OK and do nothing
-    if not first_time:
+    if outcome.duplicate:
         return {"ok": True, "duplicate": True}
 
+    return {"ok": True, "job_id": str(outcome.job_id), "duplicate": False}
+
+
+@router.post("/tms/batch", response_model=TmsWebhookBatchResponse)
+async def tms_webhook_batch(
+    payloads: Annotated[
+        list[TmsWebhookEvent],
+        Body(min_length=1, max_length=settings.WEBHOOK_BATCH_MAX_EVENTS),
+    ],
+    response: Response,
+    x_webhook_secret: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    verify_webhook(x_webhook_secret)
+
     svc = JobService(db)
-    job_id = svc.handle_tms_webhook(payload)
+    if settings.WEBHOOK_MODE == "queue":
+        await svc.enqueue_tms_webhooks(payloads)
+        response.status_code = 202
+        return TmsWebhookBatchResponse(queued=True)
+
+    outcomes = await svc.handle_tms_webhook_batch(payloads)
 
-    return {"ok": True, "job_id": str(job_id), "duplicate": False}
+    return TmsWebhookBatchResponse(
+        results=[
+            TmsWebhookResult(
+                job_id=str(o.job_id) if o.job_id else p.internal_job_id,
+                duplicate=o.duplicate,
+                status=o.status,
+                error=o.error,
+            )
+            for p, o in zip(payloads, outcomes)
+        ]
+    )
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.content import StoredBlob
+
+
+class ContentStore(ABC):
+    """
+    Immutable blobs addressed by content hash. Writing an existing key is a no-op,
+    so identical content is stored once.
+
+    Every call gets the caller's session: database backends write in the caller's
+    transaction, other backends ignore it.
+    """
+
+    @abstractmethod
+    async def put(self, db: AsyncSession, blob: StoredBlob) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, db: AsyncSession, key: str) -> Optional[StoredBlob]:
+        pass
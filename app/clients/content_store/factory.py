@@ -0,0 +1,20 @@
+from functools import lru_cache
+from typing import Optional
+
+from app.clients.content_store.base import ContentStore
+from app.clients.content_store.filesystem import FilesystemContentStore
+from app.clients.content_store.postgres import PostgresContentStore
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_content_store() -> Optional[ContentStore]:
+    """The configured content store, or None when content is kept inline on the job."""
+    settings = get_settings()
+    if settings.CONTENT_STORE == "inline":
+        return None
+    if settings.CONTENT_STORE == "postgres":
+        return PostgresContentStore()
+    if settings.CONTENT_STORE == "filesystem":
+        return FilesystemContentStore(settings.CONTENT_STORE_PATH)
+    raise ValueError(f"Unsupported content store: {settings.CONTENT_STORE}")
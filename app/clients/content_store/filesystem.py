@@ -0,0 +1,56 @@
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.content_store.base import ContentStore
+from app.core.compression import IDENTITY, ZSTD
+from app.domain.content import StoredBlob
+
+
+class FilesystemContentStore(ContentStore):
+    """
+    Blobs as files under `root`, at `<key[:2]>/<key>.<codec>`. Files are written to a
+    temporary name and renamed, so readers never see partial blobs.
+    """
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    async def put(self, db: AsyncSession, blob: StoredBlob) -> None:
+        await asyncio.to_thread(self._write, blob)
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[StoredBlob]:
+        return await asyncio.to_thread(self._read, key)
+
+    def _path(self, key: str, codec: str) -> Path:
+        return self.root / key[:2] / f"{key}.{codec}"
+
+    def _write(self, blob: StoredBlob) -> None:
+        if self._read_codec(blob.key):
+            return
+        path = self._path(blob.key, blob.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob.data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _read(self, key: str) -> Optional[StoredBlob]:
+        codec = self._read_codec(key)
+        if codec is None:
+            return None
+        return StoredBlob(key=key, codec=codec, data=self._path(key, codec).read_bytes())
+
+    def _read_codec(self, key: str) -> Optional[str]:
+        for codec in (ZSTD, IDENTITY):
+            if self._path(key, codec).exists():
+                return codec
+        return None
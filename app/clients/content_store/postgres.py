@@ -0,0 +1,17 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.content_store.base import ContentStore
+from app.domain.content import StoredBlob
+from app.repos.content_blobs import get_blob, insert_blob
+
+
+class PostgresContentStore(ContentStore):
+    """Blobs in the `content_blobs` table (bytea), written in the caller's transaction."""
+
+    async def put(self, db: AsyncSession, blob: StoredBlob) -> None:
+        await insert_blob(db, blob)
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[StoredBlob]:
+        return await get_blob(db, key)
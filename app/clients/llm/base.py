@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class LlmClient(ABC):
+    model: str
+
+    @abstractmethod
+    async def complete_json(self, system: str, user: str) -> dict[str, Any]:
+        """
+        Runs one chat completion that must answer with a JSON object.
+        Returns the parsed object.
+        """
+        pass
+
+    async def close(self) -> None:
+        """Releases pooled connections. Clients are long-lived; call on shutdown."""
+        pass
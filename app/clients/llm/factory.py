@@ -0,0 +1,20 @@
+from functools import lru_cache
+
+from app.clients.llm.base import LlmClient
+from app.clients.llm.openai import OpenAiLlmClient
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_llm_client() -> LlmClient:
+    """Process-wide LLM client, so its connection pool, concurrency and rate limits are shared."""
+    provider = get_settings().LLM_PROVIDER
+    if provider == "openai":
+        return OpenAiLlmClient()
+    raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+async def close_llm_client() -> None:
+    if get_llm_client.cache_info().currsize:
+        await get_llm_client().close()
+        get_llm_client.cache_clear()
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from typing import Any
+
+import httpx
+
+from app.clients.llm.base import LlmClient
+from app.core.config import Settings, get_settings
+from app.core.rate_limit import RateLimiter
+from app.core.retry import request_with_retries
+
+# Chat completions are side-effect free, so every transient failure is retried
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class OpenAiLlmClient(LlmClient):
+    """
+    OpenAI-compatible chat completions client (OPENAI_BASE_URL may point at any
+    compatible server, e.g. a local fake in tests).
+
+    One instance per process (see `app.clients.llm.factory.get_llm_client`): at most
+    LLM_MAX_CONCURRENCY requests are in flight and LLM_REQUESTS_PER_MINUTE start,
+    across every caller.
+    """
+
+    def __init__(self, settings: Settings | None = None, http: httpx.AsyncClient | None = None):
+        self.settings = settings or get_settings()
+        self.model = self.settings.OPENAI_MODEL
+
+        self.http = http or httpx.AsyncClient(
+            base_url=self.settings.OPENAI_BASE_URL.rstrip("/"),
+            headers={"Authorization": f"Bearer {self.settings.OPENAI_API_KEY or ''}"},
+            timeout=self.settings.LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.settings.LLM_MAX_CONCURRENCY,
+                max_keepalive_connections=self.settings.LLM_MAX_CONCURRENCY,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.settings.LLM_MAX_CONCURRENCY)
+        self._limiter = RateLimiter(self.settings.LLM_REQUESTS_PER_MINUTE)
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+    async def complete_json(self, system: str, user: str) -> dict[str, Any]:
+        payload = {
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+        }
+        async with self._semaphore:
+            response = await self._post("/chat/completions", payload)
+
+        if response.status_code >= 400:
+            raise RuntimeError(f"LLM error {response.status_code}: {response.text}")
+        try:
+            return json.loads(response.json()["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise RuntimeError(f"Unexpected LLM response: {response.text[:500]}")
+
+    async def _post(self, url: str, payload: dict[str, Any]) -> httpx.Response:
+        """POST with retries (see `app.core.retry`); each attempt is rate limited."""
+        return await request_with_retries(
+            self.http, "POST", url,
+            settings=self.settings,
+            label="LLM",
+            retry_status=RETRYABLE_STATUS,
+            before_attempt=self._limiter.acquire,
+            json=payload,
+        )
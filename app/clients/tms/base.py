@@ -4,7 +4,7 @@ from typing import Any
 
 class TmsClient(ABC):
     @abstractmethod
-    def create_job(
+    async def create_job(
         self,
         project_id: str,
         source_locale: str,
@@ -16,3 +16,7 @@ class TmsClient(ABC):
         Returns TMS job ID.
         """
         pass
+
+    async def close(self) -> None:
+        """Releases pooled connections. Clients are long-lived; call on shutdown."""
+        pass
@@ -0,0 +1,20 @@
+from functools import lru_cache
+
+from app.clients.tms.base import TmsClient
+from app.clients.tms.phrase import PhraseTmsClient
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_tms_client() -> TmsClient:
+    """Process-wide TMS client, so its connection pool is shared."""
+    provider = get_settings().TMS_PROVIDER
+    if provider == "phrase":
+        return PhraseTmsClient()
+    raise ValueError(f"Unsupported TMS provider: {provider}")
+
+
+async def close_tms_client() -> None:
+    if get_tms_client.cache_info().currsize:
+        await get_tms_client().close()
+        get_tms_client.cache_clear()
@@ -1,16 +1,56 @@
+import asyncio
 from typing import Any
+
 import httpx
 
-from app.core.config import get_settings
+from app.clients.tms.base import TmsClient
+from app.core.config import Settings, get_settings
+from app.core.retry import request_with_retries
+
+# Statuses worth retrying. For non-idempotent requests only those where the
+# server tells us it did not process the request.
+RETRYABLE_STATUS = {429, 502, 503, 504}
+RETRYABLE_STATUS_NON_IDEMPOTENT = {429, 503}
+
+# Transport errors raised before the request reached the server
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
 
 
-class PhraseTmsClient:
-    def __init__(self):
-        self.settings = get_settings()
+class PhraseTmsClient(TmsClient):
+    """
+    Phrase API client backed by one pooled `httpx.AsyncClient`.
+
+    Create it once per process (see `app.clients.tms.factory.get_tms_client`)
+    so keep-alive connections are reused across submissions. At most
+    HTTP_MAX_CONNECTIONS requests are in flight across every caller (outbox
+    submissions times chunk fan-out); the rest wait here, not in the
+    connection pool, where waiting would count against the request timeout.
+    """
+
+    def __init__(self, settings: Settings | None = None, http: httpx.AsyncClient | None = None):
+        self.settings = settings or get_settings()
         self.base_url = self.settings.TMS_BASE_URL.rstrip("/")
         self.api_token = self.settings.TMS_API_TOKEN
 
-    def create_job(
+        self.http = http or httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"ApiToken {self.api_token}"},
+            timeout=self.settings.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=self.settings.HTTP2,
+        )
+        self._semaphore = asyncio.Semaphore(self.settings.HTTP_MAX_CONNECTIONS)
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+    async def create_job(
         self,
         project_id: str,
         source_locale: str,
@@ -22,12 +62,7 @@ class PhraseTmsClient:
         Returns the TMS job UID.
         """
 
-        url = f"{self.base_url}/web/api2/v1/projects/{project_id}/jobs"
-
-        headers = {
-            "Authorization": f"ApiToken {self.api_token}",
-            "Content-Type": "application/json",
-        }
+        url = f"/web/api2/v1/projects/{project_id}/jobs"
 
         #  Simplified payload for demo purposes
         payload = {
@@ -40,15 +75,7 @@ class PhraseTmsClient:
             ]
         }
 
-        try:
-            response = httpx.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=self.settings.HTTP_TIMEOUT,
-            )
-        except httpx.RequestError as exc:
-            raise RuntimeError(f"TMS request failed: {exc}") from exc
+        response = await self._request("POST", url, json=payload)
 
         if response.status_code >= 400:
             raise RuntimeError(
@@ -63,3 +90,19 @@ class PhraseTmsClient:
             return data["jobs"][0]["uid"]
         except (KeyError, IndexError):
             raise RuntimeError(f"Unexpected TMS response: {data}")
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Sends a request with retries (see `app.core.retry`). Non-idempotent
+        requests are only retried when the server cannot have acted on them.
+        """
+        idempotent = method in IDEMPOTENT_METHODS
+        return await request_with_retries(
+            self.http, method, url,
+            settings=self.settings,
+            label="TMS",
+            retry_status=RETRYABLE_STATUS if idempotent else RETRYABLE_STATUS_NON_IDEMPOTENT,
+            retry_errors=httpx.TransportError if idempotent else NOT_SENT_ERRORS,
+            gate=self._semaphore,
+            **kwargs,
+        )
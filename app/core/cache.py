@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable
+
+from app.core.config import get_settings
+
+
+class TtlLruSet:
+    """
+    Bounded set of recently seen keys: entries expire after `ttl` seconds and the
+    least recently used ones are evicted beyond `maxsize` (0 disables the set).
+    Not thread-safe; use it from the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: Hashable) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+@lru_cache
+def get_webhook_dedup_cache() -> TtlLruSet:
+    """Process-wide cache of webhook idempotency keys already committed to the DB."""
+    settings = get_settings()
+    return TtlLruSet(maxsize=settings.WEBHOOK_DEDUP_CACHE_SIZE, ttl=settings.WEBHOOK_DEDUP_CACHE_TTL)
@@ -0,0 +1,32 @@
+"""
+Blob codecs. Names double as HTTP Content-Encoding tokens, so stored bytes can be
+sent to clients that accept them without decompressing.
+
+zstd needs the `zstd` extra (zstandard); without it blobs are stored as-is.
+"""
+from __future__ import annotations
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+IDENTITY = "identity"
+ZSTD = "zstd"
+
+
+def compress(data: bytes, level: int = 3) -> tuple[str, bytes]:
+    """Returns (codec, encoded bytes)."""
+    if zstandard is None:
+        return IDENTITY, data
+    return ZSTD, zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == IDENTITY:
+        return data
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd blob found but zstandard is not installed (install the `zstd` extra)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
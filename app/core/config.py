@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from functools import lru_cache
+from typing import Literal
 
 
 class Settings(BaseSettings):
@@ -17,6 +18,14 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Job creation: reuse an in-flight or done job with the same content fingerprint
+    JOB_CREATE_DEDUPE: bool = False
+    JOB_BATCH_MAX_ITEMS: int = 1000
+
+    # Job status events (SSE / long-poll)
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    JOB_EVENTS_MAX_WAIT_SECONDS: float = 60.0
+
     # ───────────────
     # Database
     # ───────────────
@@ -24,6 +33,28 @@ class Settings(BaseSettings):
         ...,
         description="Database connection string"
     )
+    ASYNC_DATABASE_URL: str | None = Field(
+        default=None,
+        description="Async (asyncpg) connection string; derived from DATABASE_URL when unset"
+    )
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+
+    # ───────────────
+    # Content storage
+    # ───────────────
+    # "inline" keeps source content on the job row; "postgres" / "filesystem" store it
+    # once per SHA-256 (zstd-compressed) and keep only the hash on the job
+    CONTENT_STORE: Literal["inline", "postgres", "filesystem"] = "inline"
+    CONTENT_STORE_PATH: str = Field(default="./data/content", description="Root of the filesystem store")
+    CONTENT_STORE_ZSTD_LEVEL: int = Field(default=3, description="Requires the `zstd` extra; stored uncompressed without it")
+
+    # ───────────────
+    # Translation memory
+    # ───────────────
+    # Exact matches from completed jobs pre-fill new jobs; only unseen segments go to the TMS.
+    # Opt-in: fully matched jobs skip the TMS, and every completion is learned
+    TRANSLATION_MEMORY_ENABLED: bool = False
 
     # ───────────────
     # TMS Integration
@@ -39,6 +70,75 @@ class Settings(BaseSettings):
 
     # Webhooks
     TMS_WEBHOOK_SECRET: str = Field(default="")
+    WEBHOOK_BATCH_MAX_EVENTS: int = 1000
+
+    # In-memory front cache of seen idempotency keys (the DB stays the source of truth)
+    WEBHOOK_DEDUP_CACHE_SIZE: int = Field(default=100_000, ge=0, description="0 disables the cache")
+    WEBHOOK_DEDUP_CACHE_TTL: float = 3600.0
+
+    # webhook_events partitions (also the deduplication window)
+    WEBHOOK_EVENTS_PARTITION_INTERVAL: Literal["day", "week"] = "day"
+    WEBHOOK_EVENTS_RETENTION_DAYS: int = Field(default=14, ge=1)
+    WEBHOOK_EVENTS_PARTITIONS_AHEAD: int = Field(default=3, ge=1)
+
+    # Webhook processing: "inline" applies events in the request,
+    # "queue" stores them and returns 202 (see app/workers/webhook_consumer.py)
+    WEBHOOK_MODE: Literal["inline", "queue"] = "inline"
+    WEBHOOK_QUEUE_IN_PROCESS: bool = False
+    WEBHOOK_QUEUE_SHARDS: int = Field(default=64, ge=1, description="Do not change while events are queued")
+    WEBHOOK_QUEUE_WORKERS: int = Field(default=8, ge=1)
+    WEBHOOK_QUEUE_BATCH_SIZE: int = 100
+    WEBHOOK_QUEUE_POLL_INTERVAL: float = 0.5
+    WEBHOOK_QUEUE_MAX_ATTEMPTS: int = 10
+    # Failed events are retried after base * 2^(attempts - 1) seconds, capped
+    WEBHOOK_QUEUE_RETRY_BASE_SECONDS: float = 2.0
+    WEBHOOK_QUEUE_RETRY_MAX_SECONDS: float = 300.0
+
+    # Outbox submitter
+    TMS_OUTBOX_IN_PROCESS: bool = Field(
+        default=False,
+        description="Drain the TMS outbox from the API process instead of a separate worker"
+    )
+    # Submissions in flight; with chunking each may send TMS_CHUNK_CONCURRENCY requests,
+    # all sharing the client's HTTP_MAX_CONNECTIONS request slots
+    TMS_SUBMIT_CONCURRENCY: int = Field(default=8, ge=1)
+    TMS_OUTBOX_POLL_INTERVAL: float = 1.0
+    TMS_OUTBOX_LEASE_SECONDS: int = 120
+    # Claimed entries renew their lease this often while the submission runs
+    TMS_OUTBOX_HEARTBEAT_SECONDS: float = Field(default=30.0, gt=0)
+    TMS_OUTBOX_MAX_ATTEMPTS: int = 5
+    TMS_OUTBOX_RETRY_BASE_SECONDS: float = 5.0
+
+    # Content larger than this is split into sub-jobs by key range (0 disables splitting)
+    TMS_CHUNK_MAX_BYTES: int = Field(default=1_048_576, ge=0)
+    # Chunks of one job submitted in parallel
+    TMS_CHUNK_CONCURRENCY: int = Field(default=4, ge=1)
+
+    # ───────────────
+    # Quality checks
+    # ───────────────
+    # Target/source length outside this range is flagged (sources of 20+ characters)
+    QC_MIN_LENGTH_RATIO: float = 0.3
+    QC_MAX_LENGTH_RATIO: float = 3.0
+    # Issues kept in a report (errors first); the score counts all of them
+    QC_MAX_ISSUES: int = 1000
+    # QC process pool: None = one worker per core, 0 = no pool (QC runs in a thread)
+    QC_WORKERS: int | None = Field(default=None, ge=0)
+    # Locales with more segments are checked in chunks of this size, in parallel
+    QC_CHUNK_SEGMENTS: int = Field(default=20_000, ge=1)
+
+    # QC worker: claims translated jobs (see app/workers/qc_worker.py)
+    QC_QUEUE_IN_PROCESS: bool = Field(
+        default=False,
+        description="Run the QC worker in the API process instead of a separate worker"
+    )
+    QC_QUEUE_CONCURRENCY: int = Field(default=2, ge=1)
+    QC_QUEUE_POLL_INTERVAL: float = 2.0
+    # A claimed job whose lease is not renewed for this long is re-claimed by another worker
+    QC_LEASE_SECONDS: int = Field(default=300, ge=1)
+    QC_HEARTBEAT_SECONDS: float = Field(default=60.0, gt=0)
+    QC_MAX_ATTEMPTS: int = Field(default=3, ge=1)
+    QC_RETRY_BASE_SECONDS: float = 30.0
 
     # ───────────────
     # LLM Integration
@@ -46,12 +146,32 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = Field(default="openai")
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = "gpt-4o-mini"
+    # Any OpenAI-compatible server (e.g. a local fake in tests)
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    LLM_TIMEOUT: float = 60.0
+    # Process-wide limits shared by every LLM caller (0 = no rate limit)
+    LLM_MAX_CONCURRENCY: int = Field(default=4, ge=1)
+    LLM_REQUESTS_PER_MINUTE: int = Field(default=60, ge=0)
+
+    # LLM review as part of QC; verdicts are cached per (source, target, locale, model, prompt)
+    LLM_QC_ENABLED: bool = False
+    # Segments are packed into prompts of about this many input tokens
+    LLM_QC_BATCH_TOKENS: int = Field(default=2000, ge=100)
+    LLM_QC_BATCH_MAX_SEGMENTS: int = Field(default=50, ge=1)
 
     # ───────────────
     # HTTP behavior
     # ───────────────
     HTTP_TIMEOUT: int = 30
     HTTP_RETRIES: int = 3
+    HTTP_RETRY_BACKOFF_BASE: float = 0.5
+    HTTP_RETRY_BACKOFF_MAX: float = 10.0
+
+    # Shared connection pool (one per process)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2: bool = Field(default=False, description="Requires the `http2` extra (h2)")
 
     class Config:
         env_file = ".env"
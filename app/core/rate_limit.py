@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 60 / `per_minute` seconds apart across all tasks of the
+    process (0 disables the limit). Waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        # Reserve the next slot before sleeping, so concurrent callers queue up behind it
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, Awaitable, Callable, Collection
+
+import httpx
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(settings: Settings, attempt: int, retry_after: str | None = None) -> float:
+    """
+    Seconds to wait before retry number `attempt`: the server's Retry-After when
+    given in seconds, otherwise full-jitter exponential backoff. Both are capped
+    at HTTP_RETRY_BACKOFF_MAX.
+    """
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), settings.HTTP_RETRY_BACKOFF_MAX)
+    ceiling = min(
+        settings.HTTP_RETRY_BACKOFF_MAX,
+        settings.HTTP_RETRY_BACKOFF_BASE * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
+async def request_with_retries(
+    http: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    settings: Settings,
+    label: str,
+    retry_status: Collection[int],
+    retry_errors: type[Exception] | tuple[type[Exception], ...] = httpx.TransportError,
+    gate: AbstractAsyncContextManager[Any] | None = None,
+    before_attempt: Callable[[], Awaitable[None]] | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Sends a request, retrying up to HTTP_RETRIES times with `backoff_delay`.
+    A response with a status outside `retry_status` (or the last one) is returned
+    as is; transport errors outside `retry_errors` (or on the last attempt) raise
+    RuntimeError prefixed with `label`.
+
+    Each attempt first awaits `before_attempt` (e.g. a rate limiter) and then runs
+    inside `gate` (e.g. a semaphore); the logged time covers the request only.
+    """
+    attempts = settings.HTTP_RETRIES + 1
+
+    for attempt in range(1, attempts + 1):
+        if before_attempt is not None:
+            await before_attempt()
+        try:
+            async with gate if gate is not None else nullcontext():
+                started = time.perf_counter()
+                response = await http.request(method, url, **kwargs)
+        except httpx.RequestError as exc:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.warning(
+                "%s %s %s attempt %d/%d failed after %.1f ms: %r",
+                label, method, url, attempt, attempts, elapsed_ms, exc,
+            )
+            if attempt == attempts or not isinstance(exc, retry_errors):
+                raise RuntimeError(f"{label} request failed: {exc}") from exc
+            await asyncio.sleep(backoff_delay(settings, attempt))
+            continue
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "%s %s %s attempt %d/%d -> %d (%s) in %.1f ms",
+            label, method, url, attempt, attempts, response.status_code, response.http_version, elapsed_ms,
+        )
+        if response.status_code not in retry_status or attempt == attempts:
+            return response
+        await asyncio.sleep(backoff_delay(settings, attempt, response.headers.get("Retry-After")))
+
+    raise AssertionError("unreachable")
@@ -1,10 +1,35 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+
+def async_database_url(url: str) -> URL:
+    """Same database, reached through the asyncpg driver."""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+# Request path and workers
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    echo=(settings.ENV == "dev"),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Sync engine for scripts and schema tooling
 engine = create_engine(
     settings.DATABASE_URL,
     echo=(settings.ENV == "dev"),
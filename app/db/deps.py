@@ -1,9 +1,9 @@
-from typing import Generator
-from app.db.database import SessionLocal
+from typing import AsyncGenerator
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncSessionLocal
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ContentBlob(Base):
+    """Content-addressed blobs of the `postgres` content store."""
+
+    __tablename__ = "content_blobs"
+
+    # SHA-256 (hex) of the uncompressed bytes
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # "zstd" or "identity" (see app/core/compression.py)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import DateTime, String, Text, Index
+from sqlalchemy import DateTime, Integer, String, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
@@ -30,11 +30,25 @@ class Job(Base):
     target_locales: Mapped[list[str]] = mapped_column(JSONB, nullable=False)
 
     # Store content blobs as JSONB (queryable + indexable if needed)
-    source_content: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    translated_content: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # NULL when the content lives in the content store under `source_hash`
+    source_content: Mapped[dict | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
+    source_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # SHA-256 of the canonical create request (see compute_job_fingerprint)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Translations live in job_locale_content, one row per locale
 
     # QC report as JSONB
     qc_report: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Per-segment hashes the report was computed from, {locale: {json path: hash}};
+    # deferred: only incremental QC reads them
+    qc_hashes: Mapped[dict | None] = mapped_column(JSONB, nullable=True, deferred=True)
+
+    # QC worker claim: attempts so far (reset by a re-translation), lease expiry, and
+    # a fresh id per claim that fences the claim's writes
+    qc_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    qc_lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    qc_lease_id: Mapped[str | None] = mapped_column(UUID(as_uuid=True), nullable=True)
 
     # TMS mapping
     tms_provider: Mapped[str | None] = mapped_column(String(32), nullable=True)
@@ -42,6 +56,10 @@ class Job(Base):
 
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Translation memory: (segment, target locale) pairs, and how many were pre-filled
+    tm_segments: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tm_hits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -53,4 +71,13 @@ class Job(Base):
 
 # Optional: explicit indexes (Postgres-friendly)
 Index("ix_jobs_tms_job_id", Job.tms_job_id)
-Index("ix_jobs_created_at", Job.created_at)
+# Deduplicated creates look up the latest job per fingerprint
+Index("ix_jobs_fingerprint", Job.fingerprint, Job.created_at)
+# QC workers poll translated jobs and expired qc_running leases, oldest first
+Index(
+    "ix_jobs_qc_queue",
+    Job.updated_at,
+    postgresql_where=Job.status.in_(("translated", "qc_running")),
+)
+# Keyset pagination for the job listing: ORDER BY (created_at, id)
+Index("ix_jobs_created_at", Job.created_at, Job.id)
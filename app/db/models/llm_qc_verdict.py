@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LlmQcVerdict(Base):
+    """Cached LLM QC verdict for one (source, target, locale, model, prompt version)."""
+
+    __tablename__ = "llm_qc_verdicts"
+
+    # SHA-256 of the canonical (prompt version, model, locale, source, target)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # {"ok": bool, "severity": ..., "message": ...}
+    verdict: Mapped[Any] = mapped_column(JSONB, nullable=False)
+
+    model: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TmsOutbox(Base):
+    """Pending TMS submissions, written in the same transaction as the job."""
+
+    __tablename__ = "tms_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    # One pending submission per job
+    job_id: Mapped[str] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Not claimable before this instant (used for leases and retry backoff)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+
+# Workers poll for due entries in insertion order
+Index("ix_tms_outbox_available_at", TmsOutbox.available_at, TmsOutbox.id)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TmsSubJob(Base):
+    """One TMS job of a job whose content was split into chunks."""
+
+    __tablename__ = "tms_sub_jobs"
+
+    job_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    chunk_index: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # Set once the chunk is accepted by the TMS
+    tms_job_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+
+# Webhooks identify the chunk by its TMS job id
+Index("ix_tms_sub_jobs_tms_job_id", TmsSubJob.tms_job_id)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TranslationMemory(Base):
+    """Exact-match translation memory: one target string per source string and locale pair."""
+
+    __tablename__ = "translation_memory"
+
+    # SHA-256 (hex) of the source string
+    source_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    source_locale: Mapped[str] = mapped_column(String(32), primary_key=True)
+    target_locale: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+    target_text: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Job whose translation was stored last
+    job_id: Mapped[str | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        onupdate=utcnow,
+        nullable=False,
+    )
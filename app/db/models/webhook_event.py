@@ -15,14 +15,21 @@ def utcnow() -> datetime:
 class WebhookEvent(Base):
     __tablename__ = "webhook_events"
 
-    # Idempotency key (event_id or hash). Primary key => unique by definition.
+    # Range-partitioned by day/week; partitions are created and dropped by
+    # app/workers/webhook_partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (received_at)"}
+
+    # Idempotency key (event_id or hash). The partition key has to be part of the
+    # primary key, so uniqueness of `key` is enforced by the repository instead.
     key: Mapped[str] = mapped_column(String(128), primary_key=True)
 
     provider: Mapped[str] = mapped_column(String(32), nullable=False)
     event: Mapped[str] = mapped_column(String(64), nullable=False)
     internal_job_id: Mapped[str] = mapped_column(String(64), nullable=False)
 
-    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=utcnow, nullable=False
+    )
 
 
 Index("ix_webhook_events_job", WebhookEvent.internal_job_id)
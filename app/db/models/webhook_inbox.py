@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, SmallInteger, String, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class WebhookInbox(Base):
+    """Raw webhook events accepted in queue mode, waiting for a consumer."""
+
+    __tablename__ = "webhook_inbox"
+
+    # Monotonic id = arrival order within a shard
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    # Derived from internal_job_id, so all events of a job share a shard
+    shard: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    internal_job_id: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Not retried before this instant (exponential backoff after failures)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    # Set when the event gave up retrying; kept for inspection, no longer consumed.
+    # Later events of the same job stay queued until the row is deleted or reset
+    dead_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+
+Index(
+    "ix_webhook_inbox_pending",
+    WebhookInbox.shard,
+    WebhookInbox.id,
+    postgresql_where=WebhookInbox.dead_at.is_(None),
+)
+# Earlier events of the same job gate each claimed event
+Index("ix_webhook_inbox_job", WebhookInbox.internal_job_id, WebhookInbox.id)
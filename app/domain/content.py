@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.domain.types import JobId, Locale
+from app.models.webhooks import JsonPatchOperation
+
+
+@dataclass(frozen=True)
+class LocalePatch:
+    """Partial update of one job locale: an RFC 7396 merge patch, then RFC 6902 operations."""
+
+    job_id: JobId
+    locale: Locale
+    merge: Any = None
+    operations: tuple[JsonPatchOperation, ...] = field(default_factory=tuple)
+
+
+def parse_json_pointer(pointer: str) -> list[str]:
+    """RFC 6901 pointer -> path tokens ("" is the whole document)."""
+    if not pointer:
+        return []
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Content-store entry: `key` is the SHA-256 of the uncompressed bytes."""
+
+    key: str
+    codec: str
+    data: bytes
+
+
+def canonical_json(document: Any) -> bytes:
+    """One byte representation per JSON document, so equal content hashes equally."""
+    return json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def content_key(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+# -------------------------
+# Segments
+# -------------------------
+
+SegmentPath = tuple[str, ...]
+
+
+def flatten_segments(document: Any) -> dict[SegmentPath, Any]:
+    """
+    Leaves of a content document by key path. Only objects are descended into;
+    arrays, scalars and empty objects are leaves.
+    """
+    segments: dict[SegmentPath, Any] = {}
+
+    def walk(node: Any, path: SegmentPath) -> None:
+        if isinstance(node, dict) and node:
+            for key, value in node.items():
+                walk(value, path + (key,))
+        else:
+            segments[path] = node
+
+    walk(document, ())
+    return segments
+
+
+def build_document(segments: dict[SegmentPath, Any]) -> dict[str, Any]:
+    """Inverse of `flatten_segments` for the given subset of leaves."""
+    document: dict[str, Any] = {}
+    for path, value in segments.items():
+        if not path:  # an empty document's only "leaf"
+            continue
+        node = document
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return document
+
+
+def merge_documents(base: Any, override: Any) -> Any:
+    """`override` deep-merged over `base`: objects merge key by key, anything else replaces."""
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = merge_documents(base[key], value) if key in base else value
+    return merged
+
+
+def split_document(document: dict[str, Any], max_bytes: int) -> list[dict[str, Any]]:
+    """
+    Splits a document into consecutive key ranges of about `max_bytes` of JSON each;
+    deep-merging the parts gives the document back. A leaf larger than `max_bytes`
+    becomes a part of its own.
+    """
+    if max_bytes <= 0 or len(canonical_json(document)) <= max_bytes:
+        return [document]
+
+    parts: list[dict[str, Any]] = []
+    current: dict[SegmentPath, Any] = {}
+    size = 0
+    for path, value in flatten_segments(document).items():
+        # Value plus its keys, quotes, colon and comma
+        cost = len(canonical_json(value)) + sum(len(key.encode("utf-8")) + 4 for key in path)
+        if current and size + cost > max_bytes:
+            parts.append(build_document(current))
+            current, size = {}, 0
+        current[path] = value
+        size += cost
+    if current:
+        parts.append(build_document(current))
+    return parts
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
+from uuid import UUID
 
 from app.models.job import JobStatus
 from app.domain.types import JobId, Locale, Provider
@@ -15,6 +16,15 @@ class ExternalRefs:
     tms_project_id: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class QcClaim:
+    """A job claimed by a QC worker; `lease_id` fences writes to this claim."""
+
+    job_id: JobId
+    attempts: int
+    lease_id: UUID
+
+
 @dataclass
 class JobEntity:
     id: JobId
@@ -22,12 +32,71 @@ class JobEntity:
     source_locale: Locale
     target_locales: list[Locale]
     source_content: dict[str, Any]
+    # Set when source_content lives in the content store instead of the row
+    source_hash: Optional[str] = None
 
-    translated_content: Optional[dict[str, Any]] = None
     qc_report: Optional[dict[str, Any]] = None
 
     external: ExternalRefs = ExternalRefs()
     error: Optional[str] = None
 
+    # Translation memory pre-fill (segment/locale pairs)
+    tm_segments: int = 0
+    tm_hits: int = 0
+
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class JobStatusView:
+    """Job without its content columns (source/translated content, QC report)."""
+
+    id: JobId
+    status: JobStatus
+    source_locale: Locale
+    target_locales: list[Locale]
+    external: ExternalRefs
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class JobVersion:
+    """Just enough of a job to validate a cached representation."""
+
+    id: JobId
+    status: JobStatus
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class JobTmView:
+    """What translation memory needs of a job to complete and learn its translations."""
+
+    id: JobId
+    source_locale: Locale
+    tm_hits: int
+
+
+@dataclass(frozen=True)
+class JobResultHead:
+    """The result minus translated_content, which is streamed separately."""
+
+    id: JobId
+    status: JobStatus
+    updated_at: datetime
+    qc_report_json: Optional[str]
+    translated: bool
+
+
+@dataclass(frozen=True)
+class JobResultView:
+    """What the result endpoint returns; never includes source content."""
+
+    id: JobId
+    status: JobStatus
+    translated_content: Optional[dict[str, Any]]
+    qc_report: Optional[dict[str, Any]]
+    updated_at: datetime
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.types import JobId
+
+
+@dataclass(frozen=True)
+class TmsSubmission:
+    """A claimed outbox entry: submit `job_id` to the TMS."""
+
+    id: int
+    job_id: JobId
+    attempts: int
+
+
+@dataclass(frozen=True)
+class TmsSubJob:
+    """One chunk of a split job; `tms_job_id` is None until the TMS accepted it."""
+
+    job_id: JobId
+    chunk_index: int
+    tms_job_id: Optional[str]
+    completed: bool
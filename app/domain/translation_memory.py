@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class TmPrefill:
+    """Translation-memory matches for a new job."""
+
+    # Pre-filled document per target locale (locales without any match are absent)
+    documents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # (string segment, target locale) pairs, and how many of them matched
+    segments: int = 0
+    hits: int = 0
+    # Nothing left for the TMS to translate
+    complete: bool = False
+
+
+@dataclass(frozen=True)
+class TmStats:
+    jobs: int
+    segments: int
+    hits: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.segments if self.segments else 0.0
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.domain.types import JobId
+from app.models.job import JobStatus
+
+
+@dataclass(frozen=True)
+class WebhookOutcome:
+    # None when the event's internal_job_id is not a job id at all
+    job_id: Optional[JobId]
+    duplicate: bool
+    # Status after the event, None when the event did not move the job
+    status: Optional[JobStatus] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class InboxEvent:
+    """A queued raw webhook event (see app/workers/webhook_consumer.py)."""
+
+    id: int
+    payload: dict[str, Any]
+    attempts: int
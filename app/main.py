@@ -1,13 +1,48 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from app.core.config import get_settings
+from app.clients.llm.factory import close_llm_client
+from app.clients.tms.factory import close_tms_client
 from app.api.routes import router as api_router
-from app.db.database import engine, Base
+from app.db.database import engine, async_engine, Base
+from app.services.job_events import get_job_status_broadcaster
+from app.services.qc_service import shutdown_qc_executor
+from app.workers import qc_worker, tms_submitter, webhook_consumer, webhook_partitions
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await webhook_partitions.ensure_partitions()
+    except Exception:
+        # Ingest falls back to the DEFAULT partition; the daily maintenance run catches up
+        logger.warning("Could not ensure webhook_events partitions on startup", exc_info=True)
+
+    workers = []
+    if settings.TMS_OUTBOX_IN_PROCESS:
+        workers.append(tms_submitter.start_in_background())
+    if settings.WEBHOOK_QUEUE_IN_PROCESS:
+        workers.append(webhook_consumer.start_in_background())
+    if settings.QC_QUEUE_IN_PROCESS:
+        workers.append(qc_worker.start_in_background())
+
+    yield
+
+    for task, stop in workers:
+        stop.set()
+        await task
+
+    await get_job_status_broadcaster().stop()
+    shutdown_qc_executor()
+    await close_tms_client()
+    await close_llm_client()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -15,11 +50,12 @@ app = FastAPI(
     description="Localization Solutions Backend API",
     docs_url="/docs" if settings.ENV != "prod" else None,
     redoc_url="/redoc" if settings.ENV != "prod" else None,
+    lifespan=lifespan,
 )
 
 
 @app.get("/health")
-def health():
+async def health():
     return {
         "status": "ok",
         "env": settings.ENV,
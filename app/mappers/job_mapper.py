@@ -1,7 +1,17 @@
 from __future__ import annotations
 
 from app.db.models.job import Job as JobOrm
-from app.domain.job import JobEntity, ExternalRefs
+from sqlalchemy import Row
+
+from app.domain.job import (
+    JobEntity,
+    ExternalRefs,
+    JobResultHead,
+    JobResultView,
+    JobStatusView,
+    JobTmView,
+    JobVersion,
+)
 from app.domain.types import JobId, Locale, Provider
 from app.models.job import JobStatus
 
@@ -13,7 +23,7 @@ def orm_to_domain(j: JobOrm) -> JobEntity:
         source_locale=Locale(j.source_locale),
         target_locales=[Locale(x) for x in (j.target_locales or [])],
         source_content=j.source_content or {},
-        translated_content=j.translated_content,
+        source_hash=j.source_hash,
         qc_report=j.qc_report,
         external=ExternalRefs(
             tms_provider=Provider(j.tms_provider) if j.tms_provider else None,
@@ -21,6 +31,52 @@ def orm_to_domain(j: JobOrm) -> JobEntity:
             tms_project_id=getattr(j, "tms_project_id", None),
         ),
         error=j.error,
+        tm_segments=j.tm_segments or 0,
+        tm_hits=j.tm_hits or 0,
         created_at=j.created_at,
         updated_at=j.updated_at,
     )
+
+
+def row_to_status_view(r: Row) -> JobStatusView:
+    return JobStatusView(
+        id=JobId(r.id),
+        status=JobStatus(r.status),
+        source_locale=Locale(r.source_locale),
+        target_locales=[Locale(x) for x in (r.target_locales or [])],
+        external=ExternalRefs(
+            tms_provider=Provider(r.tms_provider) if r.tms_provider else None,
+            tms_job_id=r.tms_job_id,
+        ),
+        error=r.error,
+        created_at=r.created_at,
+        updated_at=r.updated_at,
+    )
+
+
+def row_to_version(r: Row) -> JobVersion:
+    return JobVersion(id=JobId(r.id), status=JobStatus(r.status), updated_at=r.updated_at)
+
+
+def row_to_result_view(r: Row) -> JobResultView:
+    return JobResultView(
+        id=JobId(r.id),
+        status=JobStatus(r.status),
+        translated_content=r.translated_content,
+        qc_report=r.qc_report,
+        updated_at=r.updated_at,
+    )
+
+
+def row_to_result_head(r: Row) -> JobResultHead:
+    return JobResultHead(
+        id=JobId(r.id),
+        status=JobStatus(r.status),
+        updated_at=r.updated_at,
+        qc_report_json=r.qc_report,
+        translated=r.translated,
+    )
+
+
+def row_to_tm_view(r: Row) -> JobTmView:
+    return JobTmView(id=JobId(r.id), source_locale=Locale(r.source_locale), tm_hits=r.tm_hits or 0)
@@ -31,6 +31,13 @@ class JobCreateRequest(BaseModel):
     domain: str | None = Field(default=None, examples=["UI", "Legal"])
     priority: Literal["low", "normal", "high"] = "normal"
 
+    # Not part of the fingerprint
+    dedupe: bool | None = Field(
+        default=None,
+        description="Return an in-flight or done job with the same fingerprint instead of "
+        "creating a new one (defaults to JOB_CREATE_DEDUPE).",
+    )
+
 
 class ExternalRefs(BaseModel):
     tms_provider: str | None = None
@@ -42,6 +49,13 @@ class JobCreateResponse(BaseModel):
     job_id: UUID
     status: JobStatus
     created_at: datetime
+    # An existing job with the same fingerprint was returned instead of a new one
+    deduplicated: bool = False
+
+
+class JobBatchCreateResponse(BaseModel):
+    # One result per request, in request order
+    results: list[JobCreateResponse]
 
 
 class JobStatusResponse(BaseModel):
@@ -55,6 +69,20 @@ class JobStatusResponse(BaseModel):
     error: str | None = None
 
 
+class JobStatusEvent(BaseModel):
+    """Pushed on every status change (SSE `status` events / long-poll responses)."""
+
+    job_id: UUID
+    status: JobStatus
+    updated_at: datetime
+
+
+class JobListResponse(BaseModel):
+    items: list[JobStatusResponse]
+    # Pass back as `cursor` to fetch the next page; null on the last page
+    next_cursor: str | None = None
+
+
 class JobResultResponse(BaseModel):
     job_id: UUID
     status: JobStatus
@@ -16,6 +16,7 @@ class QcIssue(BaseModel):
     severity: QcSeverity
     code: str = Field(..., examples=["PLACEHOLDER_MISMATCH", "NUMBER_CHANGED"])
     message: str
+    locale: str | None = None
     source: str | None = None
     target: str | None = None
     path: str | None = Field(
@@ -26,8 +27,22 @@ class QcIssue(BaseModel):
     details: dict[str, Any] | None = None
 
 
+class QcLocaleTiming(BaseModel):
+    segments: int
+    chunks: int = 1
+    # Submission to last chunk finished (includes waiting for a free worker)
+    wall_ms: float
+    # CPU time summed over the locale's chunks
+    cpu_ms: float
+
+
 class QcReport(BaseModel):
     passed: bool
     score: float | None = Field(default=None, ge=0, le=100)
     issues: list[QcIssue] = Field(default_factory=list)
+    # Issues found; `issues` holds at most QC_MAX_ISSUES of them
+    issue_count: int = 0
+    timings: dict[str, QcLocaleTiming] = Field(default_factory=dict)
+    # Segment/locale pairs checked by this run; fewer than all after an incremental re-check
+    rechecked_segments: int | None = None
     model: str | None = Field(default=None, description="LLM model used for QC, if applicable.")
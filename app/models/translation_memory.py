@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TmStatsResponse(BaseModel):
+    since: datetime | None = None
+    jobs: int
+    # (string segment, target locale) pairs in those jobs, and how many were pre-filled
+    segments: int
+    hits: int
+    hit_rate: float = Field(..., ge=0, le=1)
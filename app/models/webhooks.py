@@ -1,6 +1,36 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from typing import Any, Literal
 
+from app.models.job import JobStatus
+
+# Each operation nests one level deeper in the UPDATE that applies it
+MAX_PATCH_OPERATIONS = 200
+
+
+class JsonPatchOperation(BaseModel):
+    """One RFC 6902 operation; `path` / `from` are RFC 6901 JSON pointers."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Any = None
+    from_: str | None = Field(default=None, alias="from")
+
+    @field_validator("path", "from_")
+    @classmethod
+    def _pointer(cls, v: str | None) -> str | None:
+        if v and not v.startswith("/"):
+            raise ValueError("must be a JSON pointer ('' or starting with '/')")
+        return v
+
+    @model_validator(mode="after")
+    def _from_required(self):
+        if self.op in ("move", "copy") and self.from_ is None:
+            raise ValueError(f"'{self.op}' requires 'from'")
+        return self
+
+
 class TmsWebhookEvent(BaseModel):
     provider: str = Field(default="phrase")
     event: Literal["job.submitted", "job.updated", "job.completed", "job.failed"]
@@ -11,5 +41,31 @@ class TmsWebhookEvent(BaseModel):
     # If TMS sends a unique event id, use it (best for idempotency)
     event_id: str | None = None
 
+    # job.completed: full content per locale. job.updated: partial content per locale,
+    # merged into what is stored (RFC 7396: nested objects merge, null removes a key)
     translated_content: dict[str, Any] | None = None
+    # job.updated / job.completed: RFC 6902 operations per locale, applied after the content
+    translated_patch: dict[str, list[JsonPatchOperation]] | None = None
     error: str | None = None
+
+    @field_validator("translated_patch")
+    @classmethod
+    def _patch_size(cls, v: dict[str, list[JsonPatchOperation]] | None):
+        if v and sum(len(ops) for ops in v.values()) > MAX_PATCH_OPERATIONS:
+            raise ValueError(f"at most {MAX_PATCH_OPERATIONS} patch operations per event")
+        return v
+
+
+class TmsWebhookResult(BaseModel):
+    job_id: str
+    duplicate: bool
+    # Job status after the event; null if the event did not move the job
+    status: JobStatus | None = None
+    error: str | None = None
+
+
+class TmsWebhookBatchResponse(BaseModel):
+    ok: bool = True
+    # Queue mode: events were stored for the consumers, no per-event results
+    queued: bool = False
+    results: list[TmsWebhookResult] = Field(default_factory=list)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.content_blob import ContentBlob
+from app.domain.content import StoredBlob
+
+
+async def insert_blob(db: AsyncSession, blob: StoredBlob) -> None:
+    stmt = (
+        insert(ContentBlob)
+        .values(key=blob.key, codec=blob.codec, size=len(blob.data), data=blob.data)
+        .on_conflict_do_nothing(index_elements=[ContentBlob.key])
+    )
+    await db.execute(stmt)
+
+
+async def get_blob(db: AsyncSession, key: str) -> Optional[StoredBlob]:
+    row = (await db.execute(select(ContentBlob.codec, ContentBlob.data).where(ContentBlob.key == key))).first()
+    return StoredBlob(key=key, codec=row.codec, data=row.data) if row else None
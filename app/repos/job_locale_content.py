@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Text, case, cast, func, literal, literal_column, null, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.job_locale_content import JobLocaleContent, utcnow
+from app.domain.content import LocalePatch, parse_json_pointer
+from app.models.webhooks import JsonPatchOperation
+
+
+async def upsert_locale_contents(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """
+    Writes (job_id, locale, content) rows in one INSERT ... ON CONFLICT DO UPDATE.
+    Each (job_id, locale) may appear at most once.
+    """
+    if not rows:
+        return
+    stmt = insert(JobLocaleContent).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobLocaleContent.job_id, JobLocaleContent.locale],
+        set_={"content": stmt.excluded.content, "updated_at": utcnow()},
+    )
+    await db.execute(stmt)
+
+
+async def upsert_locale_content(db: AsyncSession, job_id: UUID, locale: str, content: Any) -> None:
+    await upsert_locale_contents(db, [{"job_id": job_id, "locale": locale, "content": content}])
+
+
+async def get_locale_content(db: AsyncSession, job_id: UUID, locale: str) -> Optional[Any]:
+    stmt = select(JobLocaleContent.content).where(
+        JobLocaleContent.job_id == job_id,
+        JobLocaleContent.locale == locale,
+    )
+    return await db.scalar(stmt)
+
+
+async def get_locale_contents(
+    db: AsyncSession, job_id: UUID, locales: Iterable[str] | None = None
+) -> dict[str, Any]:
+    stmt = select(JobLocaleContent.locale, JobLocaleContent.content).where(JobLocaleContent.job_id == job_id)
+    if locales is not None:
+        stmt = stmt.where(JobLocaleContent.locale.in_(list(locales)))
+    return {locale: content for locale, content in await db.execute(stmt)}
+
+
+# -------------------------
+# In-database patching
+# -------------------------
+
+def _jsonb(value: Any):
+    return cast(literal(json.dumps(value), Text), JSONB)
+
+
+def _path(tokens: list[str]):
+    return literal(tokens, ARRAY(Text))
+
+
+def _get(doc, tokens: list[str]):
+    return doc.op("#>", return_type=JSONB)(_path(tokens)) if tokens else doc
+
+
+def _merge_patch(doc, patch: Any):
+    """RFC 7396: `patch` merged into `doc`. `doc` is only ever read through `->`."""
+    if not isinstance(patch, dict):
+        return _jsonb(patch)
+    merged = case((func.jsonb_typeof(doc) == "object", doc), else_=func.jsonb_build_object(type_=JSONB))
+
+    removed = [k for k, v in patch.items() if v is None]
+    if removed:
+        merged = merged.op("-", return_type=JSONB)(literal(removed, ARRAY(Text)))
+    replaced = {k: v for k, v in patch.items() if v is not None and not isinstance(v, dict)}
+    if replaced:
+        merged = merged.op("||", return_type=JSONB)(_jsonb(replaced))
+    for key, sub in patch.items():
+        if isinstance(sub, dict):
+            nested = _merge_patch(doc.op("->", return_type=JSONB)(key), sub)
+            merged = merged.op("||", return_type=JSONB)(func.jsonb_build_object(key, nested, type_=JSONB))
+    return merged
+
+
+def _add(doc, tokens: list[str], value):
+    if not tokens:
+        return value
+    parent, last = tokens[:-1], tokens[-1]
+    if last == "-":
+        in_array = func.jsonb_insert(doc, _path(parent + ["-1"]), value, True, type_=JSONB)
+    elif last.isdigit():
+        in_array = func.jsonb_insert(doc, _path(tokens), value, type_=JSONB)
+    else:
+        in_array = null()
+    return case(
+        (func.jsonb_typeof(_get(doc, parent)) == "object", func.jsonb_set(doc, _path(tokens), value, True, type_=JSONB)),
+        (func.jsonb_typeof(_get(doc, parent)) == "array", in_array),
+        else_=null(),
+    )
+
+
+def _apply_operation(doc, op: JsonPatchOperation):
+    """One RFC 6902 operation; NULL when it fails, which voids the whole patch."""
+    tokens = parse_json_pointer(op.path)
+    exists = _get(doc, tokens).is_not(None)
+    if op.op == "add":
+        return _add(doc, tokens, _jsonb(op.value))
+    if op.op == "remove":
+        removed = doc.op("#-", return_type=JSONB)(_path(tokens)) if tokens else null()
+        return case((exists, removed), else_=null())
+    if op.op == "replace":
+        replaced = func.jsonb_set(doc, _path(tokens), _jsonb(op.value), False, type_=JSONB) if tokens else _jsonb(op.value)
+        return case((exists, replaced), else_=null())
+    if op.op == "test":
+        return case((_get(doc, tokens) == _jsonb(op.value), doc), else_=null())
+
+    source = parse_json_pointer(op.from_ or "")
+    value = _get(doc, source)
+    if op.op == "move":
+        doc = doc.op("#-", return_type=JSONB)(_path(source))
+    return _add(doc, tokens, value)
+
+
+def _patched(doc, patch: LocalePatch):
+    """
+    The locale document after `patch`. Each operation reads the previous result through
+    a sub-select, so the expression grows linearly with the number of operations.
+    If any operation fails the document is returned unchanged (RFC 6902 section 5).
+    """
+    merged = _merge_patch(doc, patch.merge) if patch.merge is not None else doc
+    if not patch.operations:
+        return merged
+    result = merged
+    for op in patch.operations:
+        step = select(result.label("d")).subquery()
+        result = select(_apply_operation(step.c.d, op)).scalar_subquery()
+    return func.coalesce(result, merged, type_=JSONB)
+
+
+async def patch_locale_contents(db: AsyncSession, patches: list[LocalePatch]) -> None:
+    """
+    Applies each patch with its own INSERT ... ON CONFLICT DO UPDATE; locales without
+    a row yet are patched from `{}`. Every patch compiles to its own expression, so
+    one statement per locale keeps SQL size and bind parameters linear in the patches.
+    """
+    empty = func.jsonb_build_object(type_=JSONB)
+    existing = literal_column(f"{JobLocaleContent.__tablename__}.content", JSONB)
+
+    for p in patches:
+        stmt = insert(JobLocaleContent).values(job_id=p.job_id, locale=p.locale, content=_patched(empty, p))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobLocaleContent.job_id, JobLocaleContent.locale],
+            set_={"content": _patched(existing, p), "updated_at": utcnow()},
+        )
+        await db.execute(stmt)
@@ -1,100 +1,514 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterable, Optional
 from uuid import UUID
 
-from sqlalchemy import update, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    and_,
+    bindparam,
+    case,
+    cast,
+    column,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.job import Job as JobOrm
-from app.mappers.job_mapper import orm_to_domain
-from app.domain.job import JobEntity
+from app.db.models.job_locale_content import JobLocaleContent as LocaleContentOrm
+from app.mappers.job_mapper import (
+    orm_to_domain,
+    row_to_result_head,
+    row_to_result_view,
+    row_to_status_view,
+    row_to_tm_view,
+    row_to_version,
+)
+from app.domain.job import JobEntity, JobResultHead, JobResultView, JobStatusView, JobTmView, JobVersion, QcClaim
+from app.domain.types import JobId
 from app.models.job import JobCreateRequest, JobStatus
 
+# Repository functions only flush; the calling service owns the transaction.
 
-def create_job(db: Session, payload: JobCreateRequest) -> JobEntity:
-    job = JobOrm(
-        status=JobStatus.CREATED.value,
-        source_locale=payload.source_locale,
-        target_locales=payload.target_locales,
-        source_content=payload.content,
+FINGERPRINT_LOCK_NAMESPACE = 0x4650  # "FP"
+
+# Every status change publishes {"job_id", "status", "updated_at"} here (delivered on commit)
+JOB_STATUS_CHANNEL = "job_status"
+
+
+def _notify_status():
+    """RETURNING column that NOTIFYs the updated row's status on JOB_STATUS_CHANNEL."""
+    payload = func.json_build_object(
+        "job_id", JobOrm.id,
+        "status", JobOrm.status,
+        "updated_at", JobOrm.updated_at,
     )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    return orm_to_domain(job)
+    return func.pg_notify(JOB_STATUS_CHANNEL, cast(payload, Text)).label("notified")
+
+
+def _job_values(
+    payload: JobCreateRequest,
+    *,
+    status: str = JobStatus.CREATED.value,
+    source_hash: str | None = None,
+    fingerprint: str | None = None,
+    tm_segments: int = 0,
+    tm_hits: int = 0,
+) -> dict[str, Any]:
+    """With `source_hash` the content is already in the content store and is not stored inline."""
+    return {
+        "status": status,
+        "source_locale": payload.source_locale,
+        "target_locales": payload.target_locales,
+        "source_content": None if source_hash else payload.content,
+        "source_hash": source_hash,
+        "fingerprint": fingerprint,
+        "tm_segments": tm_segments,
+        "tm_hits": tm_hits,
+    }
 
 
-def get_job(db: Session, job_id: UUID) -> Optional[JobEntity]:
-    orm = db.get(JobOrm, job_id)
+async def create_jobs(db: AsyncSession, jobs: list[dict[str, Any]]) -> list[JobStatusView]:
+    """
+    Inserts jobs with one multi-row INSERT ... RETURNING and returns them in input order.
+    Each item holds `payload` plus the keyword arguments of `_job_values`.
+    """
+    if not jobs:
+        return []
+    stmt = insert(JobOrm).returning(*STATUS_VIEW_COLUMNS, sort_by_parameter_order=True)
+    result = await db.execute(stmt, [_job_values(**job) for job in jobs])
+    return [row_to_status_view(r) for r in result]
+
+
+async def get_job(db: AsyncSession, job_id: UUID) -> Optional[JobEntity]:
+    orm = await db.get(JobOrm, job_id)
     return orm_to_domain(orm) if orm else None
 
 
-def update_job_status(db: Session, job_id: UUID, new_status: str, error: str | None = None) -> None:
+# Everything but the content blobs
+STATUS_VIEW_COLUMNS = (
+    JobOrm.id,
+    JobOrm.status,
+    JobOrm.source_locale,
+    JobOrm.target_locales,
+    JobOrm.tms_provider,
+    JobOrm.tms_job_id,
+    JobOrm.error,
+    JobOrm.created_at,
+    JobOrm.updated_at,
+)
+
+
+async def list_jobs(
+    db: AsyncSession,
+    *,
+    statuses: Iterable[str] | None = None,
+    tms_provider: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    limit: int = 50,
+) -> list[JobStatusView]:
+    """
+    Newest first, keyset-paginated on (created_at, id): pass the last row's
+    (created_at, id) as `after` to get the next page.
+    """
+    stmt = select(*STATUS_VIEW_COLUMNS)
+    if statuses:
+        stmt = stmt.where(JobOrm.status.in_(list(statuses)))
+    if tms_provider:
+        stmt = stmt.where(JobOrm.tms_provider == tms_provider)
+    if created_from:
+        stmt = stmt.where(JobOrm.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(JobOrm.created_at < created_to)
+    if after:
+        stmt = stmt.where(tuple_(JobOrm.created_at, JobOrm.id) < tuple_(*after))
+    stmt = stmt.order_by(JobOrm.created_at.desc(), JobOrm.id.desc()).limit(limit)
+
+    rows = (await db.execute(stmt)).all()
+    return [row_to_status_view(r) for r in rows]
+
+
+async def get_job_status_view(db: AsyncSession, job_id: UUID) -> Optional[JobStatusView]:
+    row = (await db.execute(select(*STATUS_VIEW_COLUMNS).where(JobOrm.id == job_id))).first()
+    return row_to_status_view(row) if row else None
+
+
+def _select_key_path(value, key_path: list[str] | None):
+    """
+    (picked, wrapped): the sub-tree of `value` at `key_path`, and that sub-tree
+    re-nested under the same keys so the response keeps the document's shape.
+    """
+    if not key_path:
+        return value, value
+    picked = value.op("#>", return_type=JSONB)(literal(key_path, ARRAY(Text)))
+    wrapped = picked
+    for key in reversed(key_path):
+        wrapped = func.jsonb_build_object(key, wrapped, type_=JSONB)
+    return picked, wrapped
+
+
+def _has_translation():
+    return exists().where(LocaleContentOrm.job_id == JobOrm.id)
+
+
+def _translated_content_column(locales: list[str] | None, key_path: list[str] | None):
+    """
+    {locale: content} aggregated from job_locale_content, restricted to `locales` /
+    `key_path` in Postgres; NULL while the job has no translation at all.
+    """
+    picked, wrapped = _select_key_path(LocaleContentOrm.content, key_path)
+    projected = select(
+        func.jsonb_object_agg(LocaleContentOrm.locale, wrapped).filter(picked.is_not(None))
+    ).where(LocaleContentOrm.job_id == JobOrm.id)
+    if locales:
+        projected = projected.where(LocaleContentOrm.locale.in_(locales))
+    return case(
+        (_has_translation(), func.coalesce(projected.scalar_subquery(), func.jsonb_build_object(), type_=JSONB)),
+        else_=None,
+    ).label("translated_content")
+
+
+async def get_job_result_view(
+    db: AsyncSession,
+    job_id: UUID,
+    *,
+    locales: list[str] | None = None,
+    key_path: list[str] | None = None,
+) -> Optional[JobResultView]:
+    columns = (
+        JobOrm.id,
+        JobOrm.status,
+        _translated_content_column(locales, key_path),
+        JobOrm.qc_report,
+        JobOrm.updated_at,
+    )
+    row = (await db.execute(select(*columns).where(JobOrm.id == job_id))).first()
+    return row_to_result_view(row) if row else None
+
+
+async def get_job_result_head(db: AsyncSession, job_id: UUID) -> Optional[JobResultHead]:
+    """Everything of the result but translated_content, with qc_report as JSON text."""
+    stmt = select(
+        JobOrm.id,
+        JobOrm.status,
+        JobOrm.updated_at,
+        cast(JobOrm.qc_report, Text).label("qc_report"),
+        _has_translation().label("translated"),
+    ).where(JobOrm.id == job_id)
+    row = (await db.execute(stmt)).first()
+    return row_to_result_head(row) if row else None
+
+
+async def stream_translated_locales(
+    db: AsyncSession,
+    job_id: UUID,
+    *,
+    locales: list[str] | None = None,
+    key_path: list[str] | None = None,
+) -> AsyncIterator[tuple[str, str]]:
+    """(locale, JSON text) per locale, read through a server-side cursor."""
+    picked, wrapped = _select_key_path(LocaleContentOrm.content, key_path)
+    stmt = (
+        select(LocaleContentOrm.locale, cast(wrapped, Text))
+        .where(LocaleContentOrm.job_id == job_id)
+        .where(picked.is_not(None))
+    )
+    if locales:
+        stmt = stmt.where(LocaleContentOrm.locale.in_(locales))
+    result = await db.stream(stmt.execution_options(yield_per=1))
+    async for locale, text in result:
+        yield locale, text
+
+
+_LOCK_FINGERPRINTS = text(
+    "SELECT pg_advisory_xact_lock(:namespace, k) FROM unnest(:keys) AS k"
+).bindparams(bindparam("keys", type_=ARRAY(Integer)))
+
+
+async def lock_job_fingerprints(db: AsyncSession, fingerprints: Iterable[str]) -> None:
+    """Transaction-scoped locks serialising creates of the same fingerprints."""
+    # The fingerprints are already hashes: their first 32 bits make the lock keys,
+    # taken in sorted order so overlapping batches cannot deadlock
+    keys = sorted({int.from_bytes(bytes.fromhex(fp[:8]), "big", signed=True) for fp in fingerprints})
+    await db.execute(_LOCK_FINGERPRINTS, {"namespace": FINGERPRINT_LOCK_NAMESPACE, "keys": keys})
+
+
+async def find_jobs_by_fingerprints(
+    db: AsyncSession, fingerprints: Iterable[str], *, statuses: Iterable[str]
+) -> dict[str, JobStatusView]:
+    """Latest job per fingerprint among jobs in one of `statuses`."""
+    stmt = (
+        select(JobOrm.fingerprint, *STATUS_VIEW_COLUMNS)
+        .distinct(JobOrm.fingerprint)
+        .where(JobOrm.fingerprint.in_(list(fingerprints)))
+        .where(JobOrm.status.in_(list(statuses)))
+        .order_by(JobOrm.fingerprint, JobOrm.created_at.desc())
+    )
+    return {r.fingerprint: row_to_status_view(r) for r in await db.execute(stmt)}
+
+
+async def get_job_source(db: AsyncSession, job_id: UUID) -> Optional[tuple[Optional[str], Optional[str]]]:
+    """(source_hash, inline source content as JSON text), or None if the job is missing."""
+    stmt = select(JobOrm.source_hash, cast(JobOrm.source_content, Text)).where(JobOrm.id == job_id)
+    row = (await db.execute(stmt)).first()
+    return (row[0], row[1]) if row else None
+
+
+async def get_job_tm_view(db: AsyncSession, job_id: UUID) -> Optional[JobTmView]:
+    stmt = select(JobOrm.id, JobOrm.source_locale, JobOrm.tm_hits).where(JobOrm.id == job_id)
+    row = (await db.execute(stmt)).first()
+    return row_to_tm_view(row) if row else None
+
+
+async def get_job_version(db: AsyncSession, job_id: UUID) -> Optional[JobVersion]:
+    stmt = select(JobOrm.id, JobOrm.status, JobOrm.updated_at).where(JobOrm.id == job_id)
+    row = (await db.execute(stmt)).first()
+    return row_to_version(row) if row else None
+
+
+async def get_job_status(db: AsyncSession, job_id: UUID) -> Optional[JobStatus]:
+    status = await db.scalar(select(JobOrm.status).where(JobOrm.id == job_id))
+    return JobStatus(status) if status else None
+
+
+async def transition_job(
+    db: AsyncSession,
+    job_id: UUID,
+    *,
+    from_statuses: Iterable[str],
+    to_status: str,
+    values: dict[str, Any] | None = None,
+) -> Optional[JobStatus]:
+    """
+    Moves the job to `to_status` (writing `values` alongside) only if its current
+    status is one of `from_statuses`, in a single UPDATE ... RETURNING.
+    Returns the new status, or None if the job is missing or the transition is not allowed.
+    """
+    stmt = (
+        update(JobOrm)
+        .where(JobOrm.id == job_id)
+        .where(JobOrm.status.in_(list(from_statuses)))
+        .values(status=to_status, **(values or {}))
+        .returning(JobOrm.status, _notify_status())
+    )
+    status = (await db.execute(stmt)).scalar_one_or_none()
+    return JobStatus(status) if status else None
+
+
+# Per-row values accepted by `transition_jobs`; missing values keep the current column value
+_BULK_TRANSITION_COLUMNS = (
+    column("id", PG_UUID(as_uuid=True)),
+    column("tms_provider", String),
+    column("tms_job_id", String),
+    column("error", Text),
+)
+
+
+async def transition_jobs(
+    db: AsyncSession,
+    *,
+    from_statuses: Iterable[str],
+    to_status: str,
+    rows: list[dict[str, Any]],
+    shared_values: dict[str, Any] | None = None,
+) -> dict[UUID, JobStatus]:
+    """
+    Bulk `transition_job`: one UPDATE ... FROM (VALUES ...) RETURNING for many jobs.
+    Each row needs a distinct `id`; `shared_values` are written to every job that moves.
+    Returns the new status of the jobs that moved.
+    """
+    if not rows:
+        return {}
+    v = values(*_BULK_TRANSITION_COLUMNS, name="v").data(
+        [tuple(row.get(c.name) for c in _BULK_TRANSITION_COLUMNS) for row in rows]
+    )
+    stmt = (
+        update(JobOrm)
+        .where(JobOrm.id == v.c.id)
+        .where(JobOrm.status.in_(list(from_statuses)))
+        .values(
+            status=to_status,
+            tms_provider=func.coalesce(v.c.tms_provider, JobOrm.tms_provider),
+            tms_job_id=func.coalesce(v.c.tms_job_id, JobOrm.tms_job_id),
+            error=func.coalesce(v.c.error, JobOrm.error),
+            **(shared_values or {}),
+        )
+        .returning(JobOrm.id, JobOrm.status, _notify_status())
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    return {r.id: JobStatus(r.status) for r in result}
+
+
+async def get_job_statuses(db: AsyncSession, job_ids: Iterable[UUID]) -> dict[UUID, JobStatus]:
+    """Current status of each existing job; missing jobs are left out."""
+    result = await db.execute(select(JobOrm.id, JobOrm.status).where(JobOrm.id.in_(list(job_ids))))
+    return {r.id: JobStatus(r.status) for r in result}
+
+
+async def update_job_status(db: AsyncSession, job_id: UUID, new_status: str, error: str | None = None) -> None:
     stmt = (
         update(JobOrm)
         .where(JobOrm.id == job_id)
         .values(status=new_status, error=error)
+        .returning(_notify_status())
     )
-    db.execute(stmt)
-    db.commit()
+    await db.execute(stmt)
 
 
-def update_job_status_if_current(
-    db: Session,
+async def update_job_status_if_current(
+    db: AsyncSession,
     job_id: UUID,
     *,
     expected_status: str,
     new_status: str,
+    error: str | None = None,
 ) -> bool:
+    values: dict[str, Any] = {"status": new_status}
+    if error is not None:
+        values["error"] = error
     stmt = (
         update(JobOrm)
         .where(JobOrm.id == job_id)
         .where(JobOrm.status == expected_status)
-        .values(status=new_status)
+        .values(**values)
+        .returning(_notify_status())
     )
-    res = db.execute(stmt)
-    db.commit()
-    return res.rowcount == 1
+    res = await db.execute(stmt)
+    return res.first() is not None
 
 
-def set_tms_refs(db: Session, job_id: UUID, provider: str | None, tms_job_id: str | None) -> None:
+async def set_tms_refs(db: AsyncSession, job_id: UUID, provider: str | None, tms_job_id: str | None) -> None:
     stmt = (
         update(JobOrm)
         .where(JobOrm.id == job_id)
         .values(tms_provider=provider, tms_job_id=tms_job_id)
     )
-    db.execute(stmt)
-    db.commit()
+    await db.execute(stmt)
 
 
-def save_translation(db: Session, job_id: UUID, translated_content: dict) -> None:
+async def save_qc_report(
+    db: AsyncSession, job_id: UUID, qc_report: dict, qc_hashes: dict | None = None
+) -> None:
     stmt = (
         update(JobOrm)
         .where(JobOrm.id == job_id)
-        .values(translated_content=translated_content)
+        .values(qc_report=qc_report, qc_hashes=qc_hashes)
     )
-    db.execute(stmt)
-    db.commit()
+    await db.execute(stmt)
+
+
+async def get_qc_state(db: AsyncSession, job_id: UUID) -> tuple[Optional[dict], Optional[dict]]:
+    """(qc_report, qc_hashes) of the job's last QC run; both None if it never ran."""
+    row = (await db.execute(select(JobOrm.qc_report, JobOrm.qc_hashes).where(JobOrm.id == job_id))).first()
+    return (row.qc_report, row.qc_hashes) if row else (None, None)
 
 
-def save_translation_if_empty(db: Session, job_id: UUID, translated_content: dict) -> bool:
+# -------------------------
+# QC queue
+# -------------------------
+
+def _qc_claim(claim: QcClaim):
+    return and_(
+        JobOrm.id == claim.job_id,
+        JobOrm.status == JobStatus.QC_RUNNING.value,
+        JobOrm.qc_lease_id == claim.lease_id,
+    )
+
+
+async def claim_qc_jobs(db: AsyncSession, *, limit: int, lease_seconds: int) -> list[QcClaim]:
+    """
+    Moves up to `limit` translated jobs, and qc_running jobs whose lease expired
+    (their worker died), to qc_running under a new lease. Concurrent workers skip
+    each other's rows.
+    """
+    due = (
+        select(JobOrm.id)
+        .where(
+            or_(
+                JobOrm.status == JobStatus.TRANSLATED.value,
+                and_(JobOrm.status == JobStatus.QC_RUNNING.value, JobOrm.qc_lease_expires_at <= func.now()),
+            )
+        )
+        .order_by(JobOrm.updated_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
     stmt = (
         update(JobOrm)
-        .where(JobOrm.id == job_id)
-        .where(JobOrm.translated_content.is_(None))
-        .values(translated_content=translated_content)
+        .where(JobOrm.id.in_(due))
+        .values(
+            status=JobStatus.QC_RUNNING.value,
+            qc_attempts=JobOrm.qc_attempts + 1,
+            qc_lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+            qc_lease_id=func.gen_random_uuid(),
+        )
+        .returning(JobOrm.id, JobOrm.qc_attempts, JobOrm.qc_lease_id, _notify_status())
     )
-    res = db.execute(stmt)
-    db.commit()
-    return res.rowcount == 1
+    rows = (await db.execute(stmt)).all()
+    return [QcClaim(job_id=JobId(r.id), attempts=r.qc_attempts, lease_id=r.qc_lease_id) for r in rows]
 
 
-def save_qc_report(db: Session, job_id: UUID, qc_report: dict) -> None:
+async def renew_qc_lease(db: AsyncSession, claim: QcClaim, *, lease_seconds: int) -> bool:
+    """Heartbeat: extends the lease. False if the claim was lost (re-claimed or re-translated)."""
     stmt = (
         update(JobOrm)
-        .where(JobOrm.id == job_id)
-        .values(qc_report=qc_report)
+        .where(_qc_claim(claim))
+        # Lease bookkeeping is not a change to the job: keep updated_at (the ETag)
+        .values(
+            qc_lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+            updated_at=JobOrm.updated_at,
+        )
+        .returning(JobOrm.id)
+    )
+    return (await db.execute(stmt)).first() is not None
+
+
+async def retry_qc_later(db: AsyncSession, claim: QcClaim, *, delay_seconds: float) -> bool:
+    """Lets the lease expire in `delay_seconds`, when any worker may claim the job again."""
+    stmt = (
+        update(JobOrm)
+        .where(_qc_claim(claim))
+        .values(
+            qc_lease_expires_at=func.now() + timedelta(seconds=delay_seconds),
+            updated_at=JobOrm.updated_at,
+        )
+        .returning(JobOrm.id)
+    )
+    return (await db.execute(stmt)).first() is not None
+
+
+async def finish_qc(
+    db: AsyncSession,
+    claim: QcClaim,
+    *,
+    to_status: str,
+    values: dict[str, Any],
+) -> bool:
+    """
+    Ends the claim: moves the job to `to_status` with `values` (the report, or the
+    error). False, and nothing written, if the claim was lost.
+    """
+    stmt = (
+        update(JobOrm)
+        .where(_qc_claim(claim))
+        .values(status=to_status, qc_lease_expires_at=None, qc_lease_id=None, **values)
+        .returning(_notify_status())
     )
-    db.execute(stmt)
-    db.commit()
+    return (await db.execute(stmt)).first() is not None
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import String, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.llm_qc_verdict import LlmQcVerdict
+
+# Rows per INSERT, well below the 32767 bind parameters a statement may have
+INSERT_CHUNK = 1000
+
+
+async def get_verdicts(db: AsyncSession, keys: Iterable[str]) -> dict[str, Any]:
+    """{key: verdict} for the keys that are cached."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    stmt = select(LlmQcVerdict.key, LlmQcVerdict.verdict).where(
+        LlmQcVerdict.key == any_(literal(keys, ARRAY(String)))
+    )
+    return {key: verdict for key, verdict in await db.execute(stmt)}
+
+
+async def save_verdicts(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Stores (key, verdict, model) rows; a key that is already cached keeps its verdict."""
+    for start in range(0, len(rows), INSERT_CHUNK):
+        stmt = insert(LlmQcVerdict).values(rows[start:start + INSERT_CHUNK])
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=[LlmQcVerdict.key]))
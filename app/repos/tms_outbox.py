@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.tms_outbox import TmsOutbox
+from app.domain.tms_outbox import TmsSubmission
+from app.domain.types import JobId
+
+
+async def enqueue_submissions(db: AsyncSession, job_ids: list[UUID]) -> None:
+    if job_ids:
+        await db.execute(insert(TmsOutbox), [{"job_id": job_id} for job_id in job_ids])
+
+
+async def claim_due_submissions(db: AsyncSession, *, limit: int, lease_seconds: int) -> list[TmsSubmission]:
+    """
+    Claims up to `limit` due entries by pushing their `available_at` forward by the lease.
+    Concurrent workers skip each other's rows; an entry whose worker dies becomes due
+    again once the lease expires.
+    """
+    due = (
+        select(TmsOutbox.id)
+        .where(TmsOutbox.available_at <= func.now())
+        .order_by(TmsOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(TmsOutbox)
+        .where(TmsOutbox.id.in_(due))
+        .values(
+            available_at=func.now() + timedelta(seconds=lease_seconds),
+            attempts=TmsOutbox.attempts + 1,
+        )
+        .returning(TmsOutbox.id, TmsOutbox.job_id, TmsOutbox.attempts)
+    )
+    rows = (await db.execute(stmt)).all()
+    return [TmsSubmission(id=r.id, job_id=JobId(r.job_id), attempts=r.attempts) for r in rows]
+
+
+def _claimed(submission: TmsSubmission):
+    # Each claim bumps attempts: a worker whose lease expired no longer matches
+    return and_(TmsOutbox.id == submission.id, TmsOutbox.attempts == submission.attempts)
+
+
+async def renew_submission_lease(db: AsyncSession, submission: TmsSubmission, *, lease_seconds: int) -> bool:
+    """Heartbeat: extends the claim's lease. False if the entry is gone or was claimed again."""
+    stmt = (
+        update(TmsOutbox)
+        .where(_claimed(submission))
+        .values(available_at=func.now() + timedelta(seconds=lease_seconds))
+        .returning(TmsOutbox.id)
+    )
+    return (await db.execute(stmt)).first() is not None
+
+
+async def complete_submission(db: AsyncSession, submission: TmsSubmission) -> None:
+    """Deletes the entry, unless it was claimed again since `submission`."""
+    await db.execute(delete(TmsOutbox).where(_claimed(submission)))
+
+
+async def reschedule_submission(
+    db: AsyncSession, submission: TmsSubmission, *, delay_seconds: float, error: str
+) -> None:
+    """Makes the entry due again in `delay_seconds`, unless it was claimed again since `submission`."""
+    stmt = (
+        update(TmsOutbox)
+        .where(_claimed(submission))
+        .values(
+            available_at=func.now() + timedelta(seconds=delay_seconds),
+            last_error=error,
+        )
+    )
+    await db.execute(stmt)
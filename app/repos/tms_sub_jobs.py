@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.job import Job as JobOrm
+from app.db.models.tms_sub_job import TmsSubJob as TmsSubJobOrm
+from app.domain.tms_outbox import TmsSubJob
+from app.domain.types import JobId
+
+
+async def ensure_sub_jobs(db: AsyncSession, job_id: UUID, count: int) -> None:
+    """Creates chunks 0..count-1 of a job; existing chunks are kept."""
+    stmt = insert(TmsSubJobOrm).values([{"job_id": job_id, "chunk_index": i} for i in range(count)])
+    await db.execute(stmt.on_conflict_do_nothing())
+
+
+async def get_sub_jobs(db: AsyncSession, job_ids: Iterable[UUID]) -> dict[JobId, list[TmsSubJob]]:
+    """Chunks of each split job, in chunk order; jobs that were not split are absent."""
+    stmt = (
+        select(TmsSubJobOrm.job_id, TmsSubJobOrm.chunk_index, TmsSubJobOrm.tms_job_id, TmsSubJobOrm.completed_at)
+        .where(TmsSubJobOrm.job_id.in_(list(job_ids)))
+        .order_by(TmsSubJobOrm.job_id, TmsSubJobOrm.chunk_index)
+    )
+    sub_jobs: dict[JobId, list[TmsSubJob]] = defaultdict(list)
+    for r in await db.execute(stmt):
+        sub_jobs[JobId(r.job_id)].append(
+            TmsSubJob(
+                job_id=JobId(r.job_id),
+                chunk_index=r.chunk_index,
+                tms_job_id=r.tms_job_id,
+                completed=r.completed_at is not None,
+            )
+        )
+    return dict(sub_jobs)
+
+
+async def set_sub_job_refs(db: AsyncSession, job_id: UUID, refs: dict[int, str]) -> None:
+    """Records the TMS job id of each submitted chunk."""
+    for chunk_index, tms_job_id in refs.items():
+        await db.execute(
+            update(TmsSubJobOrm)
+            .where(TmsSubJobOrm.job_id == job_id, TmsSubJobOrm.chunk_index == chunk_index)
+            .values(tms_job_id=tms_job_id)
+        )
+
+
+async def complete_sub_job(db: AsyncSession, job_id: UUID, tms_job_id: str) -> int:
+    """
+    Marks the chunk completed and returns how many chunks of the job are still open.
+    Locks the job row, so whichever chunk completes last sees 0.
+    """
+    await db.execute(select(JobOrm.id).where(JobOrm.id == job_id).with_for_update())
+    await db.execute(
+        update(TmsSubJobOrm)
+        .where(
+            TmsSubJobOrm.job_id == job_id,
+            TmsSubJobOrm.tms_job_id == tms_job_id,
+            TmsSubJobOrm.completed_at.is_(None),
+        )
+        .values(completed_at=func.now())
+    )
+    stmt = select(func.count()).where(TmsSubJobOrm.job_id == job_id, TmsSubJobOrm.completed_at.is_(None))
+    return await db.scalar(stmt)
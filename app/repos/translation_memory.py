@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import String, any_, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.job import Job as JobOrm
+from app.db.models.translation_memory import TranslationMemory, utcnow
+
+# Rows per INSERT, well below the 32767 bind parameters a statement may have
+UPSERT_CHUNK = 1000
+
+
+async def lookup_translations(
+    db: AsyncSession,
+    *,
+    source_locale: str,
+    target_locales: Iterable[str],
+    source_hashes: Iterable[str],
+) -> dict[tuple[str, str], str]:
+    """{(source_hash, target_locale): target_text} for the hashes known in memory."""
+    hashes = list(source_hashes)
+    if not hashes:
+        return {}
+    stmt = select(
+        TranslationMemory.source_hash,
+        TranslationMemory.target_locale,
+        TranslationMemory.target_text,
+    ).where(
+        TranslationMemory.source_locale == source_locale,
+        TranslationMemory.target_locale == any_(literal(list(target_locales), ARRAY(String))),
+        TranslationMemory.source_hash == any_(literal(hashes, ARRAY(String))),
+    )
+    return {(h, locale): text for h, locale, text in await db.execute(stmt)}
+
+
+async def upsert_translations(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """
+    Stores (source_hash, source_locale, target_locale, target_text, job_id) rows;
+    the last row wins for a repeated key. Rows are written in key order, so concurrent
+    jobs sharing strings lock them in the same order and cannot deadlock.
+    """
+    unique = {(r["source_hash"], r["source_locale"], r["target_locale"]): r for r in rows}
+    rows = [unique[key] for key in sorted(unique)]
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        stmt = insert(TranslationMemory).values(rows[start:start + UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                TranslationMemory.source_hash,
+                TranslationMemory.source_locale,
+                TranslationMemory.target_locale,
+            ],
+            set_={
+                "target_text": stmt.excluded.target_text,
+                "job_id": stmt.excluded.job_id,
+                "updated_at": utcnow(),
+            },
+        )
+        await db.execute(stmt)
+
+
+async def get_memory_stats(db: AsyncSession, *, since: datetime | None = None) -> tuple[int, int, int]:
+    """(jobs, segments, pre-filled segments) over jobs created since `since`."""
+    stmt = select(
+        func.count(),
+        func.coalesce(func.sum(JobOrm.tm_segments), 0),
+        func.coalesce(func.sum(JobOrm.tm_hits), 0),
+    )
+    if since is not None:
+        stmt = stmt.where(JobOrm.created_at >= since)
+    jobs, segments, hits = (await db.execute(stmt)).one()
+    return int(jobs), int(segments), int(hits)
@@ -1,11 +1,35 @@
-from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
+import zlib
+from datetime import timedelta
 
+from sqlalchemy import Integer, String, bindparam, column, delete, exists, func, insert, select, text, values
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
 from app.db.models.webhook_event import WebhookEvent
 
+# Namespace for pg advisory locks on idempotency keys
+KEY_LOCK_NAMESPACE = 0x4B59  # "KY"
+
+_REGISTER_COLUMNS = (
+    column("key", String),
+    column("provider", String),
+    column("event", String),
+    column("internal_job_id", String),
+)
+
+_LOCK_KEYS = text(
+    "SELECT pg_advisory_xact_lock(:namespace, h) FROM unnest(:hashes) AS h"
+).bindparams(bindparam("hashes", type_=ARRAY(Integer)))
+
 
-def try_register_webhook_event(
-    db: Session,
+def _key_lock_id(key: str) -> int:
+    h = zlib.crc32(key.encode("utf-8"))
+    return h - 2**32 if h >= 2**31 else h
+
+
+async def try_register_webhook_event(
+    db: AsyncSession,
     *,
     key: str,
     provider: str,
@@ -16,13 +40,52 @@ def try_register_webhook_event(
     Returns True if this is the first time we see this event key.
     Returns False if it's a duplicate (already processed/seen).
     """
-    stmt = insert(WebhookEvent).values(
-        key=key,
-        provider=provider,
-        event=event,
-        internal_job_id=internal_job_id,
-    ).on_conflict_do_nothing(index_elements=["key"])
-
-    result = db.execute(stmt)
-    db.commit()
-    return result.rowcount == 1
+    fresh = await register_webhook_events(
+        db,
+        [{"key": key, "provider": provider, "event": event, "internal_job_id": internal_job_id}],
+    )
+    return key in fresh
+
+
+async def register_webhook_events(db: AsyncSession, events: list[dict]) -> set[str]:
+    """
+    Multi-row variant of `try_register_webhook_event`.
+    `events` are dicts with key/provider/event/internal_job_id (distinct keys);
+    returns the keys seen for the first time within the retention window.
+
+    `webhook_events` is partitioned by `received_at`, so `key` cannot be globally
+    unique. Registrations of the same key are serialised with transaction-scoped
+    advisory locks (taken in a fixed order), then inserted only if absent.
+    """
+    if not events:
+        return set()
+
+    # Own statement: under READ COMMITTED the insert below then sees rows
+    # committed by whoever held the lock before us
+    lock_ids = sorted({_key_lock_id(e["key"]) for e in events})
+    await db.execute(_LOCK_KEYS, {"namespace": KEY_LOCK_NAMESPACE, "hashes": lock_ids})
+
+    window = timedelta(days=get_settings().WEBHOOK_EVENTS_RETENTION_DAYS)
+    v = values(*_REGISTER_COLUMNS, name="v").data(
+        [tuple(e[c.name] for c in _REGISTER_COLUMNS) for e in events]
+    )
+    seen = (
+        exists()
+        .where(WebhookEvent.key == v.c.key)
+        .where(WebhookEvent.received_at >= func.now() - window)
+    )
+    stmt = (
+        insert(WebhookEvent)
+        .from_select(
+            ["key", "provider", "event", "internal_job_id", "received_at"],
+            select(v.c.key, v.c.provider, v.c.event, v.c.internal_job_id, func.now()).where(~seen),
+        )
+        .returning(WebhookEvent.key)
+    )
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+
+async def unregister_webhook_events(db: AsyncSession, keys: list[str]) -> None:
+    if keys:
+        await db.execute(delete(WebhookEvent).where(WebhookEvent.key.in_(keys)))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import delete, exists, func, insert, or_, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.webhook_inbox import WebhookInbox
+from app.domain.webhooks import InboxEvent
+
+# Namespace for pg advisory locks on inbox shards
+SHARD_LOCK_NAMESPACE = 0x5748  # "WH"
+
+
+async def enqueue_webhook_events(db: AsyncSession, events: list[dict]) -> None:
+    """`events` are dicts with shard/internal_job_id/payload, inserted in order."""
+    if events:
+        await db.execute(insert(WebhookInbox), events)
+
+
+async def try_lock_shard(db: AsyncSession, shard: int) -> bool:
+    """
+    Transaction-scoped lock: at most one consumer (across all nodes) drains a
+    shard at a time, which keeps events of a job in arrival order.
+    """
+    return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(SHARD_LOCK_NAMESPACE, shard))))
+
+
+async def claim_shard_events(db: AsyncSession, shard: int, *, limit: int) -> list[InboxEvent]:
+    """
+    The oldest due events of the shard. An event waiting for a retry, or dead-lettered,
+    holds back every later event of its job, so a job's events never apply out of order.
+    """
+    earlier = aliased(WebhookInbox)
+    blocked = exists().where(
+        earlier.internal_job_id == WebhookInbox.internal_job_id,
+        earlier.id < WebhookInbox.id,
+        or_(earlier.dead_at.is_not(None), earlier.available_at > func.now()),
+    )
+    stmt = (
+        select(WebhookInbox.id, WebhookInbox.payload, WebhookInbox.attempts)
+        .where(WebhookInbox.shard == shard)
+        .where(WebhookInbox.dead_at.is_(None))
+        .where(WebhookInbox.available_at <= func.now())
+        .where(~blocked)
+        .order_by(WebhookInbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = (await db.execute(stmt)).all()
+    return [InboxEvent(id=r.id, payload=r.payload, attempts=r.attempts) for r in rows]
+
+
+async def delete_inbox_events(db: AsyncSession, event_ids: list[int]) -> None:
+    if event_ids:
+        await db.execute(delete(WebhookInbox).where(WebhookInbox.id.in_(event_ids)))
+
+
+async def record_inbox_failure(
+    db: AsyncSession, event_id: int, *, error: str, dead: bool, retry_in: float = 0.0
+) -> None:
+    """Counts a failed attempt: the event is retried in `retry_in` seconds, or dead-lettered."""
+    stmt = (
+        update(WebhookInbox)
+        .where(WebhookInbox.id == event_id)
+        .values(
+            attempts=WebhookInbox.attempts + 1,
+            last_error=error,
+            available_at=func.now() + timedelta(seconds=retry_in),
+            dead_at=func.now() if dead else None,
+        )
+    )
+    await db.execute(stmt)
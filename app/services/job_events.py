@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import AsyncIterator
+from uuid import UUID
+
+from app.db.database import async_engine
+from app.models.job import JobStatusEvent
+from app.repos.jobs import JOB_STATUS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatusBroadcaster:
+    """
+    Fans job status NOTIFYs out to in-process subscribers.
+
+    One pooled connection per process LISTENs on JOB_STATUS_CHANNEL (started on
+    first subscription, re-established if it drops); each subscriber gets a
+    queue of `JobStatusEvent`s for one job.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[UUID, set[asyncio.Queue[JobStatusEvent]]] = defaultdict(set)
+        self._listening = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="job-status-listener")
+        await self._listening.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def subscribe(self, job_id: UUID) -> asyncio.Queue[JobStatusEvent]:
+        await self.start()
+        queue: asyncio.Queue[JobStatusEvent] = asyncio.Queue()
+        self._subscribers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: UUID, queue: asyncio.Queue[JobStatusEvent]) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job_id]
+
+    @contextlib.asynccontextmanager
+    async def subscription(self, job_id: UUID) -> AsyncIterator[asyncio.Queue[JobStatusEvent]]:
+        queue = await self.subscribe(job_id)
+        try:
+            yield queue
+        finally:
+            self.unsubscribe(job_id, queue)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    closed = asyncio.Event()
+                    raw.add_termination_listener(lambda _: closed.set())
+                    await raw.add_listener(JOB_STATUS_CHANNEL, self._on_notify)
+                    self._listening.set()
+                    await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LISTEN %s failed, reconnecting", JOB_STATUS_CHANNEL)
+            self._listening.clear()
+            await asyncio.sleep(1)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        event = JobStatusEvent.model_validate_json(payload)
+        for queue in self._subscribers.get(event.job_id, ()):
+            queue.put_nowait(event)
+
+
+@lru_cache
+def get_job_status_broadcaster() -> JobStatusBroadcaster:
+    return JobStatusBroadcaster()
@@ -1,168 +1,934 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import zlib
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.job import JobEntity, JobResultHead, JobResultView, JobStatusView, JobVersion, QcClaim
 from app.domain.types import JobId
-from app.clients.tms.phrase import PhraseTmsClient
+from app.clients.tms.base import TmsClient
+from app.clients.content_store.factory import get_content_store
+from app.clients.tms.factory import get_tms_client
+from app.core.compression import IDENTITY, compress, decompress
+from app.core.cache import get_webhook_dedup_cache
 from app.core.config import Settings, get_settings
 from app.models.job import JobCreateRequest, JobStatus
+from app.models.qc import QcReport
 from app.models.webhooks import TmsWebhookEvent
 from app.repos.jobs import (
-    create_job,
+    create_jobs,
+    finish_qc,
     get_job,
-    save_qc_report,
-    save_translation,
+    get_job_status,
+    get_job_statuses,
+    find_jobs_by_fingerprints,
+    get_job_result_head,
+    get_job_source,
+    get_job_tm_view,
+    get_job_result_view,
+    get_job_status_view,
+    lock_job_fingerprints,
+    retry_qc_later,
+    get_job_version,
+    get_qc_state,
+    stream_translated_locales,
+    list_jobs,
     set_tms_refs,
-    update_job_status,
+    transition_job,
+    transition_jobs,
     update_job_status_if_current,
 )
-from app.repos.webhook_events import try_register_webhook_event
+from app.repos.job_locale_content import get_locale_contents, patch_locale_contents, upsert_locale_contents
+from app.repos.tms_outbox import complete_submission, enqueue_submissions, reschedule_submission
+from app.repos.tms_sub_jobs import complete_sub_job, ensure_sub_jobs, get_sub_jobs, set_sub_job_refs
+from app.repos.webhook_inbox import (
+    claim_shard_events,
+    delete_inbox_events,
+    enqueue_webhook_events,
+    record_inbox_failure,
+    try_lock_shard,
+)
+from app.repos.webhook_events import (
+    register_webhook_events,
+    try_register_webhook_event,
+    unregister_webhook_events,
+)
+from app.domain.tms_outbox import TmsSubJob, TmsSubmission
+from app.domain.content import LocalePatch, StoredBlob, canonical_json, content_key, split_document
+from app.domain.translation_memory import TmPrefill
+from app.domain.webhooks import WebhookOutcome
+from app.services.llm_qc import LlmQcService
+from app.services.qc_rules import SegmentHashes
+from app.services.qc_service import QCService
+from app.services.translation_memory import TranslationMemoryService
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_TRANSITIONS: dict[str, set[str]] = {
-    JobStatus.CREATED.value: {JobStatus.SUBMITTED.value, JobStatus.FAILED.value},
-    JobStatus.SUBMITTED.value: {JobStatus.IN_PROGRESS.value, JobStatus.FAILED.value},
-    JobStatus.IN_PROGRESS.value: {JobStatus.TRANSLATED.value, JobStatus.FAILED.value},
+    # Webhooks can overtake the outbox submitter, so created/submitted may jump ahead
+    JobStatus.CREATED.value: {
+        JobStatus.SUBMITTED.value,
+        JobStatus.IN_PROGRESS.value,
+        JobStatus.TRANSLATED.value,
+        JobStatus.FAILED.value,
+    },
+    JobStatus.SUBMITTED.value: {JobStatus.IN_PROGRESS.value, JobStatus.TRANSLATED.value, JobStatus.FAILED.value},
+    # in_progress -> in_progress: progress updates from the TMS
+    JobStatus.IN_PROGRESS.value: {JobStatus.IN_PROGRESS.value, JobStatus.TRANSLATED.value, JobStatus.FAILED.value},
     JobStatus.TRANSLATED.value: {JobStatus.QC_RUNNING.value, JobStatus.DONE.value, JobStatus.FAILED.value},
     JobStatus.QC_RUNNING.value: {JobStatus.DONE.value, JobStatus.FAILED.value},
     JobStatus.DONE.value: set(),
     JobStatus.FAILED.value: set(),
 }
 
-def can_transition(self, current: str, new: str) -> bool:
+# Status each TMS event moves the job to
+WEBHOOK_TARGET_STATUS: dict[str, str] = {
+    "job.submitted": JobStatus.IN_PROGRESS.value,
+    "job.updated": JobStatus.IN_PROGRESS.value,
+    "job.completed": JobStatus.TRANSLATED.value,
+    "job.failed": JobStatus.FAILED.value,
+}
+
+# Jobs that already have a translation. New content for one of them (a re-translation)
+# moves it back to translated so QC checks what changed; kept out of
+# ALLOWED_TRANSITIONS so that events without content never reopen a job.
+RETRANSLATION_FROM = {JobStatus.TRANSLATED.value, JobStatus.QC_RUNNING.value, JobStatus.DONE.value}
+# QC starts over: attempts restart and a running claim is voided
+RETRANSLATION_RESET: dict[str, Any] = {"qc_attempts": 0, "qc_lease_expires_at": None, "qc_lease_id": None}
+
+def can_transition(current: str, new: str) -> bool:
     return new in ALLOWED_TRANSITIONS.get(current, set())
 
-def webhook_key(payload: TmsWebhookEvent) -> str:
-    """Stable idempotency key."""
+def is_terminal(status: str) -> bool:
+    return not ALLOWED_TRANSITIONS.get(status)
+
+def allowed_predecessors(new: str) -> set[str]:
+    return {current for current, targets in ALLOWED_TRANSITIONS.items() if new in targets}
+
+def webhook_shard(internal_job_id: str, shards: int) -> int:
+    """Stable shard for a job; changing the shard count reorders jobs with queued events."""
+    return zlib.crc32(internal_job_id.encode("utf-8")) % shards
+
+# A chunk's webhook arrived before the submitter recorded the chunk
+UNKNOWN_SUB_JOB = "Unknown sub-job, retry later"
+INVALID_JOB_ID = "internal_job_id is not a valid job id"
+
+
+def parse_job_id(internal_job_id: str) -> Optional[JobId]:
+    """The job id of a webhook event, or None when it is not a UUID."""
+    try:
+        return JobId(UUID(str(internal_job_id)))
+    except ValueError:
+        return None
+
+# Statuses whose job a deduplicated create may return instead of creating a new one
+REUSABLE_STATUSES = {s.value for s in JobStatus} - {JobStatus.FAILED.value}
+
+
+def compute_job_fingerprint(payload: JobCreateRequest) -> str:
+    """SHA-256 of what determines the TMS work: locales, content, project and domain."""
+    return content_key(
+        canonical_json(
+            {
+                "source_locale": payload.source_locale,
+                "target_locales": sorted(set(payload.target_locales)),
+                "content": payload.content,
+                "project": payload.project,
+                "domain": payload.domain,
+            }
+        )
+    )
+
+
+def compute_idempotency_key(payload: TmsWebhookEvent) -> str:
+    # Prefer event_id if provided by TMS
     if payload.event_id:
         return f"{payload.provider}:{payload.event_id}"
-    return f"{payload.provider}:{payload.event}:{payload.internal_job_id}:{payload.tms_job_id or ''}"
+
+    # Fallback: stable hash of the payload content. translated_patch only counts when
+    # present, so keys of events without one match those stored before it existed.
+    exclude = {"translated_patch"} if payload.translated_patch is None else None
+    data = payload.model_dump(by_alias=True, exclude=exclude)
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return f"{payload.provider}:sha256:{digest}"
 
 class JobService:
     """Application service for job lifecycle orchestration."""
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, tms_client: TmsClient | None = None):
         self.db = db
         self.settings = get_settings()
-        self.tms_client = PhraseTmsClient()
+        self.tms_client = tms_client or get_tms_client()
+        self.dedup_cache = get_webhook_dedup_cache()
+        self.translation_memory = TranslationMemoryService(db)
 
     # -------------------------
     # Jobs API
     # -------------------------
 
-    def create_job(self, payload: JobCreateRequest):
-        job = create_job(self.db, payload)
+    async def create_job(self, payload: JobCreateRequest) -> tuple[JobStatusView, bool]:
+        return (await self.create_jobs([payload]))[0]
 
-        try:
-            tms_job_id = self.tms_client.create_job(
-                project_id=self.settings.TMS_PROJECT_ID,
-                source_locale=payload.source_locale,
-                target_locales=payload.target_locales,
-                content=payload.content,
+    async def create_jobs(self, payloads: list[JobCreateRequest]) -> list[tuple[JobStatusView, bool]]:
+        """
+        Persists the jobs and their TMS outbox entries in one transaction, with one
+        multi-row INSERT each. Submission happens asynchronously (see app/workers/tms_submitter.py).
+        With deduplication, a request whose fingerprint matches an in-flight or done job
+        (or an earlier request of the batch) gets that job instead.
+        Returns (job, deduplicated) per request, in input order.
+        """
+        fingerprints = [compute_job_fingerprint(p) for p in payloads]
+        dedupe = [self.settings.JOB_CREATE_DEDUPE if p.dedupe is None else p.dedupe for p in payloads]
+        existing: dict[str, JobStatusView] = {}
+        if any(dedupe):
+            wanted = {fp for fp, d in zip(fingerprints, dedupe) if d}
+            # Held until commit, so concurrent identical creates cannot both miss
+            await lock_job_fingerprints(self.db, wanted)
+            existing = await find_jobs_by_fingerprints(self.db, wanted, statuses=REUSABLE_STATUSES)
+
+        new: list[int] = []
+        first_new: dict[str, int] = {}
+        for i, fp in enumerate(fingerprints):
+            if not (dedupe[i] and (fp in existing or fp in first_new)):
+                new.append(i)
+                first_new.setdefault(fp, i)
+        if not new:
+            await self.db.rollback()
+            return [(existing[fp], True) for fp in fingerprints]
+
+        prefills: list[TmPrefill] = []
+        rows = []
+        for i in new:
+            payload = payloads[i]
+            prefill = TmPrefill()
+            if self.translation_memory.enabled:
+                prefill = await self.translation_memory.prefill(
+                    payload.source_locale, payload.target_locales, payload.content
+                )
+            prefills.append(prefill)
+            rows.append(
+                {
+                    "payload": payload,
+                    # Fully covered by the translation memory: nothing to send to the TMS
+                    "status": JobStatus.TRANSLATED.value if prefill.complete else JobStatus.CREATED.value,
+                    "source_hash": await self._store_source(payload.content),
+                    "fingerprint": fingerprints[i],
+                    "tm_segments": prefill.segments,
+                    "tm_hits": prefill.hits,
+                }
             )
-        except Exception as e:
-            update_job_status(self.db, job.id, JobStatus.FAILED.value, error=str(e))
-            raise HTTPException(status_code=502, detail="Failed to submit job to TMS")
+        jobs = await create_jobs(self.db, rows)
+        await upsert_locale_contents(
+            self.db,
+            [
+                {"job_id": job.id, "locale": locale, "content": doc}
+                for job, prefill in zip(jobs, prefills)
+                for locale, doc in prefill.documents.items()
+            ],
+        )
+        await enqueue_submissions(self.db, [job.id for job, prefill in zip(jobs, prefills) if not prefill.complete])
+        await self.db.commit()
 
-        
-        set_tms_refs(self.db, job.id, self.settings.TMS_PROVIDER, tms_job_id)
-        update_job_status(self.db, job.id, JobStatus.SUBMITTED.value)
-        
-        return job
+        for job, prefill in zip(jobs, prefills):
+            if prefill.segments:
+                logger.info(
+                    "Job %s: %d/%d segments pre-filled from translation memory",
+                    job.id, prefill.hits, prefill.segments,
+                )
+
+        created = dict(zip(new, jobs))
+        results = []
+        for i, fp in enumerate(fingerprints):
+            if i in created:
+                results.append((created[i], False))
+            elif fp in existing:
+                results.append((existing[fp], True))
+            else:
+                results.append((created[first_new[fp]], True))
+        return results
     
-    def get_job(self, job_id: JobId):
-        job = get_job(self.db, job_id)
+    async def list_jobs(
+        self,
+        *,
+        statuses: list[JobStatus] | None = None,
+        tms_provider: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int = 50,
+    ) -> tuple[list[JobStatusView], tuple[datetime, UUID] | None]:
+        """Returns one page and the keyset position of the next one (None on the last page)."""
+        jobs = await list_jobs(
+            self.db,
+            statuses=[s.value for s in statuses] if statuses else None,
+            tms_provider=tms_provider,
+            created_from=created_from,
+            created_to=created_to,
+            after=after,
+            limit=limit + 1,
+        )
+        if len(jobs) <= limit:
+            return jobs, None
+        last = jobs[limit - 1]
+        return jobs[:limit], (last.created_at, last.id)
+
+    async def get_job_status_view(self, job_id: JobId) -> JobStatusView:
+        job = await get_job_status_view(self.db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    async def get_job_version(self, job_id: JobId) -> JobVersion:
+        job = await get_job_version(self.db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    async def get_job_result_view(
+        self,
+        job_id: JobId,
+        *,
+        locales: list[str] | None = None,
+        key_path: list[str] | None = None,
+    ) -> JobResultView:
+        job = await get_job_result_view(self.db, job_id, locales=locales, key_path=key_path)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    async def stream_job_result(
+        self,
+        job_id: JobId,
+        *,
+        locales: list[str] | None = None,
+        key_path: list[str] | None = None,
+    ) -> tuple[JobResultHead, AsyncIterator[tuple[str, str]]]:
+        """
+        The result head plus an iterator of (locale, JSON text), both read from one
+        REPEATABLE READ snapshot. The iterator must be consumed before the session closes.
+        """
+        await self.db.rollback()
+        await self.db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        head = await get_job_result_head(self.db, job_id)
+        if not head:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return head, stream_translated_locales(self.db, job_id, locales=locales, key_path=key_path)
+
+    async def get_job(self, job_id: JobId):
+        job = await get_job(self.db, job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         return job
 
+    # -------------------------
+    # Source content
+    # -------------------------
+
+    async def get_source_blob(self, job_id: JobId) -> StoredBlob:
+        """The job's source content as stored (possibly compressed), without decoding it."""
+        source = await get_job_source(self.db, job_id)
+        if source is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        source_hash, source_json = source
+        if source_hash is None:
+            raw = source_json.encode("utf-8")
+            return StoredBlob(key=content_key(raw), codec=IDENTITY, data=raw)
+        return await self._load_blob(source_hash)
+
+    async def _load_source(self, job_id: JobId) -> dict[str, Any]:
+        """Source content by job id, reading only the source columns."""
+        source_hash, source_json = await get_job_source(self.db, job_id)
+        if source_hash is None:
+            return json.loads(source_json)
+        blob = await self._load_blob(source_hash)
+        return json.loads(await asyncio.to_thread(decompress, blob.codec, blob.data))
+
+    async def load_source_content(self, job: JobEntity) -> dict[str, Any]:
+        if job.source_hash is None:
+            return job.source_content
+        blob = await self._load_blob(job.source_hash)
+        return json.loads(await asyncio.to_thread(decompress, blob.codec, blob.data))
+
+    async def _submission_content(self, job: JobEntity) -> dict[str, Any]:
+        """Source content minus what translation memory already filled in for every locale."""
+        content = await self.load_source_content(job)
+        if not job.tm_hits:
+            return content
+        return await self.translation_memory.pending_content(job.id, content, job.target_locales)
+
+    async def _store_source(self, content: dict[str, Any]) -> Optional[str]:
+        """Puts the content in the content store (if configured) and returns its key."""
+        store = get_content_store()
+        if store is None:
+            return None
+        raw = canonical_json(content)
+        codec, data = await asyncio.to_thread(compress, raw, self.settings.CONTENT_STORE_ZSTD_LEVEL)
+        blob = StoredBlob(key=content_key(raw), codec=codec, data=data)
+        await store.put(self.db, blob)
+        return blob.key
+
+    async def _load_blob(self, key: str) -> StoredBlob:
+        store = get_content_store()
+        if store is None:
+            raise RuntimeError(f"Content {key} is in a content store, but CONTENT_STORE is 'inline'")
+        blob = await store.get(self.db, key)
+        if blob is None:
+            raise RuntimeError(f"Content {key} is missing from the content store")
+        return blob
+
+    # -------------------------
+    # TMS submission (outbox worker)
+    # -------------------------
+
+    async def submit_to_tms(self, submission: TmsSubmission) -> None:
+        """
+        Submits one claimed outbox entry and moves the job to `submitted_to_tms`.
+        Failures are retried with exponential backoff until TMS_OUTBOX_MAX_ATTEMPTS,
+        after which the job is marked failed. The reads are committed before the
+        upload, so no transaction stays open during TMS calls.
+        """
+        job = await get_job(self.db, submission.job_id)
+        if not job:
+            await complete_submission(self.db, submission)
+            await self.db.commit()
+            return
+
+        try:
+            content = await self._submission_content(job)
+            await self.db.commit()
+            chunks = split_document(content, self.settings.TMS_CHUNK_MAX_BYTES)
+            if len(chunks) > 1:
+                # The chunks' TMS ids live on tms_sub_jobs
+                await self._submit_chunks(job, chunks)
+                tms_job_id = None
+            else:
+                tms_job_id = await self.tms_client.create_job(
+                    project_id=self.settings.TMS_PROJECT_ID,
+                    source_locale=job.source_locale,
+                    target_locales=list(job.target_locales),
+                    content=content,
+                )
+        except Exception as e:
+            if submission.attempts >= self.settings.TMS_OUTBOX_MAX_ATTEMPTS:
+                # A webhook may already have moved the job forward: only fail a job still waiting
+                await update_job_status_if_current(
+                    self.db,
+                    job.id,
+                    expected_status=JobStatus.CREATED.value,
+                    new_status=JobStatus.FAILED.value,
+                    error=str(e),
+                )
+                await complete_submission(self.db, submission)
+            else:
+                delay = self.settings.TMS_OUTBOX_RETRY_BASE_SECONDS * 2 ** (submission.attempts - 1)
+                await reschedule_submission(self.db, submission, delay_seconds=delay, error=str(e))
+            await self.db.commit()
+            return
+
+        await set_tms_refs(self.db, job.id, self.settings.TMS_PROVIDER, tms_job_id)
+        # A webhook may already have moved the job forward
+        await update_job_status_if_current(
+            self.db,
+            job.id,
+            expected_status=JobStatus.CREATED.value,
+            new_status=JobStatus.SUBMITTED.value,
+        )
+        await complete_submission(self.db, submission)
+        await self.db.commit()
+
+    async def _submit_chunks(self, job: JobEntity, chunks: list[dict[str, Any]]) -> None:
+        """
+        Submits the chunks the TMS has not accepted yet, TMS_CHUNK_CONCURRENCY at a time.
+        The chunk rows are committed first so webhooks can tell the job was split;
+        accepted chunks are recorded even if others fail, so a retry resubmits only those.
+        """
+        await ensure_sub_jobs(self.db, job.id, len(chunks))
+        pending = [s.chunk_index for s in (await get_sub_jobs(self.db, [job.id]))[job.id] if s.tms_job_id is None]
+        await self.db.commit()
+        semaphore = asyncio.Semaphore(self.settings.TMS_CHUNK_CONCURRENCY)
+
+        async def submit(index: int) -> str:
+            async with semaphore:
+                return await self.tms_client.create_job(
+                    project_id=self.settings.TMS_PROJECT_ID,
+                    source_locale=job.source_locale,
+                    target_locales=list(job.target_locales),
+                    content=chunks[index],
+                )
+
+        results = await asyncio.gather(*(submit(i) for i in pending), return_exceptions=True)
+        await set_sub_job_refs(
+            self.db, job.id, {i: r for i, r in zip(pending, results) if not isinstance(r, BaseException)}
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        logger.info("Job %s submitted to the TMS as %d chunks", job.id, len(chunks))
+
     # -------------------------
     # Webhook handling
     # -------------------------
 
-    def handle_tms_webhook(self, payload: TmsWebhookEvent) -> JobId:
+    async def handle_tms_webhook(self, payload: TmsWebhookEvent) -> WebhookOutcome:
+        """
+        Updates job state based on webhook event, in one transaction.
+        Keys committed recently by this process are answered from memory.
+        """
+        key = compute_idempotency_key(payload)
+        if key in self.dedup_cache:
+            return WebhookOutcome(job_id=parse_job_id(payload.internal_job_id), duplicate=True)
+
+        outcome = await self.apply_tms_webhook(payload, key=key)
+        await self.db.commit()
+        self.dedup_cache.add(key)
+        return outcome
+
+    async def apply_tms_webhook(self, payload: TmsWebhookEvent, key: str | None = None) -> WebhookOutcome:
         """
-        Updates job state based on webhook event.
-        Returns the job_id.
+        Registers the event key and applies the event with a single conditional UPDATE.
+        Does not commit: the caller owns the transaction.
         """
-        job_id: JobId = UUID(str(payload.internal_job_id))
+        job_id = parse_job_id(payload.internal_job_id)
+        if job_id is None:
+            raise HTTPException(status_code=422, detail=INVALID_JOB_ID)
 
         # Idempotency: ignore duplicates
-        key = webhook_key(payload)
-        first_time = try_register_webhook_event(
+        first_time = await try_register_webhook_event(
             self.db,
-            key=key,
+            key=key or compute_idempotency_key(payload),
             provider=payload.provider,
             event=payload.event,
             internal_job_id=str(job_id),
         )
         if not first_time:
-            return job_id
+            return WebhookOutcome(job_id=job_id, duplicate=True)
 
-        job = get_job(self.db, job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Internal job not found")
+        finishing = False
+        if payload.tms_job_id:
+            sub_jobs = (await get_sub_jobs(self.db, [job_id])).get(job_id)
+            if sub_jobs:
+                routed = await self._route_sub_job_event(job_id, payload, sub_jobs)
+                if routed is None:
+                    # The submitter has not recorded this chunk yet; the TMS retries
+                    raise HTTPException(status_code=503, detail=UNKNOWN_SUB_JOB)
+                payload, finishing = routed
 
-        # Always store refs
-        set_tms_refs(self.db, job_id, payload.provider, payload.tms_job_id)
+        target = WEBHOOK_TARGET_STATUS[payload.event]
+        new_status = await transition_job(
+            self.db,
+            job_id,
+            from_statuses=allowed_predecessors(target),
+            to_status=target,
+            values=self._webhook_values(payload),
+        )
 
-        current = job.status
-        if current in (JobStatus.DONE.value, JobStatus.FAILED.value):
-            return job_id
+        if new_status is None:
+            # Only a miss pays for the extra lookup
+            current = await get_job_status(self.db, job_id)
+            if current is None:
+                raise HTTPException(status_code=404, detail="Internal job not found")
+            if self._retranslates(job_id, current, payload):
+                new_status = await transition_job(
+                    self.db,
+                    job_id,
+                    from_statuses=RETRANSLATION_FROM,
+                    to_status=JobStatus.TRANSLATED.value,
+                    values={**self._webhook_values(payload), **RETRANSLATION_RESET},
+                )
+        if new_status is not None:
+            contents, patches = self._translation_writes(job_id, payload)
+        else:
+            contents, patches = await self._write_through(job_id, current, payload)
+        contents = await self._complete_translations(job_id, contents)
+        await upsert_locale_contents(self.db, contents)
+        await patch_locale_contents(self.db, patches)
+        if finishing and new_status is not None:
+            new_status = await self._finish_split_job(job_id) or new_status
 
-        if payload.event in ("job.submitted", "job.updated"):
-            self._on_submitted_or_updated(job_id, current)
-            return job_id
+        return WebhookOutcome(job_id=job_id, duplicate=False, status=new_status)
 
-        if payload.event == "job.failed":
-            self._on_failed(job_id, payload.error)
-            return job_id
+    async def handle_tms_webhook_batch(self, payloads: list[TmsWebhookEvent]) -> list[WebhookOutcome]:
+        """
+        Applies a burst of events in one transaction: one multi-row idempotency insert,
+        then one bulk UPDATE per (round, target status). Round N holds the N-th new event
+        of every job, so events for the same job still apply in arrival order.
+        Returns one outcome per payload, in input order.
+        """
+        payloads = list(payloads)
+        outcomes: list[Optional[WebhookOutcome]] = [None] * len(payloads)
+        job_ids = [parse_job_id(p.internal_job_id) for p in payloads]
 
-        if payload.event == "job.completed":
-            self._on_completed(job_id, current, payload.translated_content)
-            return job_id
+        first_index: dict[str, int] = {}
+        for i, payload in enumerate(payloads):
+            if job_ids[i] is None:
+                # Reported like an unknown job; the rest of the batch still applies
+                outcomes[i] = WebhookOutcome(job_id=None, duplicate=False, error=INVALID_JOB_ID)
+                continue
+            key = compute_idempotency_key(payload)
+            if key in first_index or key in self.dedup_cache:
+                outcomes[i] = WebhookOutcome(job_id=job_ids[i], duplicate=True)
+            else:
+                first_index[key] = i
 
-        raise HTTPException(status_code=400, detail="Unknown event")
-    
-    def _on_submitted_or_updated(self, job_id: JobId, current_status: str) -> None:
-        if not can_transition(current_status, JobStatus.IN_PROGRESS.value):
-            return
+        fresh = await register_webhook_events(
+            self.db,
+            [
+                {
+                    "key": key,
+                    "provider": payloads[i].provider,
+                    "event": payloads[i].event,
+                    "internal_job_id": str(job_ids[i]),
+                }
+                for key, i in first_index.items()
+            ],
+        )
+
+        pending: dict[JobId, list[int]] = defaultdict(list)
+        for key, i in first_index.items():
+            if key in fresh:
+                pending[job_ids[i]].append(i)
+            else:
+                outcomes[i] = WebhookOutcome(job_id=job_ids[i], duplicate=True)
+
+        # Chunk events of split jobs
+        split_ids = {job_ids[i] for indices in pending.values() for i in indices if payloads[i].tms_job_id}
+        split = await get_sub_jobs(self.db, split_ids) if split_ids else {}
+        finishing: set[JobId] = set()
+        deferred: list[int] = []
+        for job_id, sub_jobs in split.items():
+            indices = pending[job_id]
+            for n, i in enumerate(indices):
+                if not payloads[i].tms_job_id:
+                    continue
+                routed = await self._route_sub_job_event(job_id, payloads[i], sub_jobs)
+                if routed is None:
+                    # Chunk not recorded yet: it and the job's later events wait for the TMS retry
+                    deferred += indices[n:]
+                    del indices[n:]
+                    break
+                payloads[i], last = routed
+                if last:
+                    finishing.add(job_id)
+        if deferred:
+            index_keys = {i: key for key, i in first_index.items()}
+            await unregister_webhook_events(self.db, [index_keys[i] for i in deferred])
+            for i in deferred:
+                del first_index[index_keys[i]]
+                outcomes[i] = WebhookOutcome(job_id=job_ids[i], duplicate=False, error=UNKNOWN_SUB_JOB)
+
+        missing: set[JobId] = set()
+        for round_no in range(max((len(ix) for ix in pending.values()), default=0)):
+            by_target: dict[str, list[int]] = defaultdict(list)
+            for indices in pending.values():
+                if round_no < len(indices):
+                    i = indices[round_no]
+                    by_target[WEBHOOK_TARGET_STATUS[payloads[i].event]].append(i)
+
+            for target, indices in by_target.items():
+                statuses = await transition_jobs(
+                    self.db,
+                    from_statuses=allowed_predecessors(target),
+                    to_status=target,
+                    rows=[{"id": job_ids[i], **self._webhook_values(payloads[i])} for i in indices],
+                )
+                unmoved_ids = {job_ids[i] for i in indices if job_ids[i] not in statuses}
+                current = await get_job_statuses(self.db, unmoved_ids) if unmoved_ids else {}
+                missing |= unmoved_ids - current.keys()
+                statuses |= await transition_jobs(
+                    self.db,
+                    from_statuses=RETRANSLATION_FROM,
+                    to_status=JobStatus.TRANSLATED.value,
+                    rows=[
+                        {"id": job_ids[i], **self._webhook_values(payloads[i])}
+                        for i in indices
+                        if job_ids[i] in current and self._retranslates(job_ids[i], current[job_ids[i]], payloads[i])
+                    ],
+                    shared_values=RETRANSLATION_RESET,
+                )
+
+                contents: list[dict[str, Any]] = []
+                patches: list[LocalePatch] = []
+                for i in indices:
+                    if job_ids[i] in statuses:
+                        rows, locale_patches = self._translation_writes(job_ids[i], payloads[i])
+                    elif job_ids[i] in current:
+                        rows, locale_patches = await self._write_through(
+                            job_ids[i], current[job_ids[i]], payloads[i]
+                        )
+                    else:
+                        continue
+                    contents += await self._complete_translations(job_ids[i], rows)
+                    patches += locale_patches
+                await upsert_locale_contents(self.db, contents)
+                await patch_locale_contents(self.db, patches)
+                for i in indices:
+                    outcomes[i] = WebhookOutcome(job_id=job_ids[i], duplicate=False, status=statuses.get(job_ids[i]))
+
+        for job_id in finishing:
+            status = await self._finish_split_job(job_id)
+            if status is not None:
+                last = pending[job_id][-1]
+                outcomes[last] = WebhookOutcome(job_id=job_id, duplicate=False, status=status)
 
-        if current_status in (JobStatus.SUBMITTED.value, JobStatus.CREATED.value):
-            update_job_status_if_current(
-                self.db,
-                job_id,
-                expected_status=current_status,
-                new_status=JobStatus.IN_PROGRESS.value,
+        # Unknown jobs: report per event and forget their keys, like the single-event 404
+        if missing:
+            await unregister_webhook_events(
+                self.db, [key for key, i in first_index.items() if job_ids[i] in missing]
             )
+            for job_id in missing:
+                for i in pending[job_id]:
+                    outcomes[i] = WebhookOutcome(job_id=job_id, duplicate=False, error="Internal job not found")
+
+        await self.db.commit()
+        for key, i in first_index.items():
+            if job_ids[i] not in missing:
+                self.dedup_cache.add(key)
+        return [o for o in outcomes if o is not None]
+
+    # -------------------------
+    # Webhook queue mode
+    # -------------------------
+
+    async def enqueue_tms_webhooks(self, payloads: list[TmsWebhookEvent]) -> None:
+        """
+        Persists raw events for the shard consumers; nothing is applied yet.
+        Events whose key is in the front cache (already applied) are dropped here;
+        the consumers still deduplicate against the DB.
+        """
+        keyed = {}
+        for p in payloads:
+            key = compute_idempotency_key(p)
+            if key not in self.dedup_cache:
+                keyed.setdefault(key, p)
+
+        await enqueue_webhook_events(
+            self.db,
+            [
+                {
+                    "shard": webhook_shard(p.internal_job_id, self.settings.WEBHOOK_QUEUE_SHARDS),
+                    "internal_job_id": p.internal_job_id,
+                    "payload": p.model_dump(mode="json"),
+                }
+                for p in keyed.values()
+            ],
+        )
+        await self.db.commit()
+
+    async def consume_webhook_shard(self, shard: int) -> int:
+        """
+        Applies the oldest due events of one shard, in order, in one transaction.
+        Each event runs in a savepoint. A failing event is retried with exponential
+        backoff and dead-lettered after WEBHOOK_QUEUE_MAX_ATTEMPTS; either way it
+        blocks later events of the same job. Returns the number of events applied.
+        """
+        if not await try_lock_shard(self.db, shard):
+            await self.db.rollback()
+            return 0
+
+        events = await claim_shard_events(self.db, shard, limit=self.settings.WEBHOOK_QUEUE_BATCH_SIZE)
+        done: list[int] = []
+        applied: list[str] = []
+        blocked: set[str] = set()
+
+        for event in events:
+            payload = TmsWebhookEvent.model_validate(event.payload)
+            if payload.internal_job_id in blocked:
+                continue
+            key = compute_idempotency_key(payload)
+            try:
+                async with self.db.begin_nested():
+                    await self.apply_tms_webhook(payload, key=key)
+            except Exception as e:
+                # Client errors (unknown job) will not fix themselves
+                permanent = isinstance(e, HTTPException) and e.status_code < 500
+                dead = permanent or event.attempts + 1 >= self.settings.WEBHOOK_QUEUE_MAX_ATTEMPTS
+                retry_in = min(
+                    self.settings.WEBHOOK_QUEUE_RETRY_BASE_SECONDS * 2 ** event.attempts,
+                    self.settings.WEBHOOK_QUEUE_RETRY_MAX_SECONDS,
+                )
+                await record_inbox_failure(self.db, event.id, error=repr(e), dead=dead, retry_in=retry_in)
+                blocked.add(payload.internal_job_id)
+                continue
+            done.append(event.id)
+            applied.append(key)
+
+        await delete_inbox_events(self.db, done)
+        await self.db.commit()
+        for key in applied:
+            self.dedup_cache.add(key)
+        return len(done)
+
+    async def _route_sub_job_event(
+        self, job_id: JobId, payload: TmsWebhookEvent, sub_jobs: list[TmsSubJob]
+    ) -> Optional[tuple[TmsWebhookEvent, bool]]:
+        """
+        The event to apply to a split job for an event of one of its chunks, and whether
+        it completed the last open chunk. A chunk's `job.completed` is applied as a
+        `job.updated` merge; the job becomes `translated` once every chunk completed.
+        None when the chunk is not recorded yet (its webhook overtook the submitter).
+        """
+        if payload.tms_job_id not in {s.tms_job_id for s in sub_jobs}:
+            return None
+        routed = payload.model_copy(update={"tms_job_id": None})
+        if payload.event != "job.completed":
+            return routed, False
+        remaining = await complete_sub_job(self.db, job_id, payload.tms_job_id)
+        return routed.model_copy(update={"event": "job.updated"}), remaining == 0
 
-    def _on_failed(self, job_id: JobId, error: Optional[str]) -> None:
-        update_job_status(
+    async def _finish_split_job(self, job_id: JobId) -> Optional[JobStatus]:
+        """Moves a split job whose chunks all completed to `translated`; its documents are already merged."""
+        new_status = await transition_job(
             self.db,
             job_id,
-            JobStatus.FAILED.value,
-            error=error or "TMS failed",
+            from_statuses={JobStatus.IN_PROGRESS.value},
+            to_status=JobStatus.TRANSLATED.value,
         )
+        if new_status is not None and self.translation_memory.enabled:
+            await self.translation_memory.learn(
+                await get_job_tm_view(self.db, job_id),
+                await self._load_source(job_id),
+                await get_locale_contents(self.db, job_id),
+            )
+        return new_status
 
-    def _on_completed(self, job_id: JobId, current_status: str, translated_content: Optional[dict]) -> None:
-        if translated_content is not None:
-            save_translation(self.db, job_id, translated_content)
+    def _retranslates(self, job_id: JobId, current: JobStatus, payload: TmsWebhookEvent) -> bool:
+        """Whether the event re-translates a job that already has a translation."""
+        return current.value in RETRANSLATION_FROM and any(self._translation_writes(job_id, payload))
 
-        if current_status in (JobStatus.TRANSLATED.value, JobStatus.QC_RUNNING.value, JobStatus.DONE.value):
-            return
+    async def _write_through(
+        self, job_id: JobId, current: JobStatus, payload: TmsWebhookEvent
+    ) -> tuple[list[dict[str, Any]], list[LocalePatch]]:
+        """
+        Writes for an event that moves no status, e.g. a late `job.submitted`: TMS refs
+        are always stored, and content is still written unless the job is done or
+        failed. Returns the translation writes, like `_translation_writes`.
+        """
+        if payload.tms_job_id:
+            await set_tms_refs(self.db, job_id, payload.provider, payload.tms_job_id)
+        if is_terminal(current.value):
+            return [], []
+        return self._translation_writes(job_id, payload)
+
+    @staticmethod
+    def _webhook_values(payload: TmsWebhookEvent) -> dict[str, Any]:
+        values: dict[str, Any] = {"tms_provider": payload.provider}
+        if payload.tms_job_id:
+            values["tms_job_id"] = payload.tms_job_id
+
+        if payload.event == "job.failed":
+            values["error"] = payload.error or "TMS failed"
+        return values
+
+    async def _complete_translations(self, job_id: JobId, contents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Completed locales merged over translation-memory pre-fill; the delivered
+        translations are learned for future jobs.
+        """
+        if not contents:
+            return contents
+        # Jobs pre-filled before TM was turned off still need the merge: tm_hits is one narrow read
+        job = await get_job_tm_view(self.db, job_id)
+        if not job.tm_hits and not self.translation_memory.enabled:
+            return contents
+        source = await self._load_source(job_id) if self.translation_memory.enabled else None
+        documents = await self.translation_memory.complete(
+            job, source, {row["locale"]: row["content"] for row in contents}
+        )
+        return [{"job_id": job_id, "locale": locale, "content": doc} for locale, doc in documents.items()]
 
-        if current_status in (JobStatus.IN_PROGRESS.value, JobStatus.SUBMITTED.value, JobStatus.CREATED.value):
-            update_job_status_if_current(
-                self.db,
-                job_id,
-                expected_status=current_status,
-                new_status=JobStatus.TRANSLATED.value,
+    @staticmethod
+    def _translation_writes(
+        job_id: JobId, payload: TmsWebhookEvent
+    ) -> tuple[list[dict[str, Any]], list[LocalePatch]]:
+        """
+        (full locale documents to upsert, partial updates to apply in the DB).
+        `job.completed` content replaces each locale; `job.updated` content is merged
+        into it; `translated_patch` operations run after either.
+        """
+        contents: list[dict[str, Any]] = []
+        merges: dict[str, Any] = {}
+        if payload.event == "job.completed" and payload.translated_content:
+            contents = [
+                {"job_id": job_id, "locale": locale, "content": content}
+                for locale, content in payload.translated_content.items()
+            ]
+        elif payload.event == "job.updated" and payload.translated_content:
+            merges = {locale: patch for locale, patch in payload.translated_content.items() if patch is not None}
+
+        operations = {locale: ops for locale, ops in (payload.translated_patch or {}).items() if ops}
+        if payload.event not in ("job.updated", "job.completed"):
+            operations = {}
+        patches = [
+            LocalePatch(
+                job_id=job_id,
+                locale=locale,
+                merge=merges.get(locale),
+                operations=tuple(operations.get(locale, ())),
             )
+            for locale in merges.keys() | operations.keys()
+        ]
+        return contents, patches
+
+    # ---------- QC ----------
+    async def run_qc(self, job_id: JobId) -> tuple[QcReport, SegmentHashes]:
+        """
+        QC of the job's current translations. Only segments whose source or target
+        changed since the stored report are re-checked. The reads are committed
+        before QC starts, so no transaction stays open while it runs (new LLM
+        verdicts are committed on their own). Returns the report and the segment
+        hashes, which `process_qc` stores under the claim's fence.
+        """
+        job = await get_job(self.db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        source = await self.load_source_content(job)
+        translated = await get_locale_contents(self.db, job_id)
+        previous, previous_hashes = await get_qc_state(self.db, job_id)
+        await self.db.commit()
 
+        llm = LlmQcService(self.db) if self.settings.LLM_QC_ENABLED else None
+        return await QCService(llm=llm).run_incremental(
+            source_content=source,
+            translated_content=translated,
+            previous=QcReport.model_validate(previous) if previous is not None else None,
+            previous_hashes=previous_hashes,
+        )
+
+    async def process_qc(self, claim: QcClaim) -> None:
+        """
+        Runs QC for a job claimed by the QC worker, then writes the report and `done`
+        in a new transaction. Failures are retried with exponential backoff until
+        QC_MAX_ATTEMPTS, after which the job is marked failed. Nothing is written
+        once the claim is lost to another worker.
+        """
+        try:
+            if claim.attempts > self.settings.QC_MAX_ATTEMPTS:
+                # Leases kept expiring: the job crashes or stalls its workers
+                raise RuntimeError(f"QC did not finish in {self.settings.QC_MAX_ATTEMPTS} attempts")
+            report, hashes = await self.run_qc(claim.job_id)
+        except Exception as e:
+            await self.db.rollback()
+            logger.warning("QC of job %s failed (attempt %d): %r", claim.job_id, claim.attempts, e)
+            if claim.attempts >= self.settings.QC_MAX_ATTEMPTS:
+                await finish_qc(self.db, claim, to_status=JobStatus.FAILED.value, values={"error": f"QC failed: {e}"})
+            else:
+                delay = self.settings.QC_RETRY_BASE_SECONDS * 2 ** (claim.attempts - 1)
+                await retry_qc_later(self.db, claim, delay_seconds=delay)
+            await self.db.commit()
+            return
 
-    # ---------- QC saving (used by worker later) ----------
-    def save_qc(self, job_id, qc_report: dict) -> None:
-        save_qc_report(self.db, job_id, qc_report)
-        update_job_status(self.db, job_id, JobStatus.DONE.value)
+        values = {"qc_report": report.model_dump(mode="json"), "qc_hashes": hashes}
+        if await finish_qc(self.db, claim, to_status=JobStatus.DONE.value, values=values):
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+            logger.warning("QC claim on job %s (attempt %d) was lost; report discarded", claim.job_id, claim.attempts)
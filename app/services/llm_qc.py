@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.llm.base import LlmClient
+from app.clients.llm.factory import get_llm_client
+from app.core.config import get_settings
+from app.domain.content import canonical_json, content_key
+from app.models.qc import QcIssue, QcSeverity
+from app.repos.llm_qc_verdicts import get_verdicts, save_verdicts
+from app.services.qc_rules import LocaleSegments
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache key: bump it whenever SYSTEM_PROMPT changes meaning
+PROMPT_VERSION = "qc-1"
+
+SYSTEM_PROMPT = (
+    "You review translations of software and marketing strings. For every item decide whether "
+    "`target` is an accurate, fluent translation of `source` into `locale`. Placeholders, markup "
+    "and numbers are checked elsewhere; ignore them. Reply with a JSON object "
+    '{"results": [{"id": <item id>, "ok": true|false, "severity": "error"|"warning"|"info", '
+    '"message": "<short reason, empty when ok>"}]} with exactly one result per item.'
+)
+
+# Rough prompt size: ~4 characters per token, plus the JSON around each item
+_CHARS_PER_TOKEN = 4
+_ITEM_OVERHEAD_TOKENS = 20
+
+
+@dataclass(frozen=True)
+class _ReviewItem:
+    key: str
+    locale: str
+    path: str
+    source: str
+    target: str
+
+
+class LlmQcService:
+    """
+    LLM review of translated segments. Verdicts are cached in `llm_qc_verdicts` by
+    (source, target, locale, model, prompt version), so reruns and repeated strings
+    are free; only misses are sent, packed into token-budgeted batch prompts.
+    """
+
+    def __init__(self, db: AsyncSession, llm_client: LlmClient | None = None):
+        self.db = db
+        self.settings = get_settings()
+        self.llm = llm_client or get_llm_client()
+
+    @property
+    def model(self) -> str:
+        return self.llm.model
+
+    @property
+    def version(self) -> str:
+        """Changes whenever verdicts may change: the model or the prompt."""
+        return f"{PROMPT_VERSION}/{self.model}"
+
+    async def review(self, work: LocaleSegments) -> tuple[list[QcIssue], dict[str, set[str]]]:
+        """
+        Issues for the translated string segments the LLM flags, and the paths per
+        locale it could not review; `work` holds each locale's segments and their
+        aligned targets.
+        Batches run concurrently; the client enforces LLM_MAX_CONCURRENCY and
+        LLM_REQUESTS_PER_MINUTE. The cache read is committed before the first
+        request and new verdicts right after the last, so no transaction waits
+        on the LLM; verdicts stay valid whatever happens to the job.
+        """
+        items = [
+            _ReviewItem(
+                key=self._key(locale, source, target), locale=locale, path=path, source=source, target=target
+            )
+            for locale, (segments, values) in work.items()
+            for (path, source), target in zip(segments, values)
+            if isinstance(target, str) and source.strip() and target.strip()
+        ]
+        verdicts = await get_verdicts(self.db, {item.key for item in items})
+        await self.db.commit()
+
+        pending: dict[str, _ReviewItem] = {}
+        for item in items:
+            if item.key not in verdicts:
+                pending.setdefault(item.key, item)
+        batches = self._batches(list(pending.values()))
+        results = await asyncio.gather(*(self._review_batch(batch) for batch in batches), return_exceptions=True)
+
+        fresh: dict[str, dict[str, Any]] = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.warning("LLM QC batch of %d segments failed: %r", len(batch), result)
+                continue
+            fresh.update(result)
+        await save_verdicts(self.db, [{"key": k, "verdict": v, "model": self.model} for k, v in fresh.items()])
+        await self.db.commit()
+        verdicts.update(fresh)
+        logger.info(
+            "LLM QC: %d segments, %d distinct uncached, %d reviewed in %d batches",
+            len(items), len(pending), len(fresh), len(batches),
+        )
+
+        issues = [
+            self._issue(item, verdicts[item.key])
+            for item in items
+            if item.key in verdicts and not verdicts[item.key]["ok"]
+        ]
+        unreviewed = len(pending) - len(fresh)
+        missed: dict[str, set[str]] = {}
+        for item in items:
+            if item.key not in verdicts:
+                missed.setdefault(item.locale, set()).add(item.path)
+        if unreviewed:
+            issues.append(
+                QcIssue(
+                    severity=QcSeverity.WARNING,
+                    code="LLM_REVIEW_INCOMPLETE",
+                    message=f"{unreviewed} segments could not be reviewed by the LLM",
+                    details={"model": self.model, "unreviewed": unreviewed},
+                )
+            )
+        return issues, missed
+
+    def _key(self, locale: str, source: str, target: str) -> str:
+        return content_key(canonical_json([PROMPT_VERSION, self.model, locale, source, target]))
+
+    def _batches(self, items: list[_ReviewItem]) -> list[list[_ReviewItem]]:
+        budget = self.settings.LLM_QC_BATCH_TOKENS
+        batches: list[list[_ReviewItem]] = []
+        batch: list[_ReviewItem] = []
+        tokens = 0
+        for item in items:
+            cost = (len(item.source) + len(item.target)) // _CHARS_PER_TOKEN + _ITEM_OVERHEAD_TOKENS
+            if batch and (tokens + cost > budget or len(batch) >= self.settings.LLM_QC_BATCH_MAX_SEGMENTS):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(item)
+            tokens += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _review_batch(self, batch: list[_ReviewItem]) -> dict[str, dict[str, Any]]:
+        """{key: verdict} for the items the LLM answered; unanswered items stay uncached."""
+        prompt = json.dumps(
+            {
+                "items": [
+                    {"id": i, "locale": item.locale, "source": item.source, "target": item.target}
+                    for i, item in enumerate(batch)
+                ]
+            },
+            ensure_ascii=False,
+        )
+        answer = await self.llm.complete_json(SYSTEM_PROMPT, prompt)
+        results = answer.get("results") if isinstance(answer, dict) else None
+        by_id = {r.get("id"): r for r in results or [] if isinstance(r, dict)}
+
+        severities = {s.value for s in QcSeverity}
+        verdicts = {}
+        for i, item in enumerate(batch):
+            result = by_id.get(i)
+            if result is None:
+                continue
+            severity = result.get("severity")
+            verdicts[item.key] = {
+                "ok": bool(result.get("ok", True)),
+                "severity": severity if severity in severities else QcSeverity.WARNING.value,
+                "message": str(result.get("message") or ""),
+            }
+        return verdicts
+
+    def _issue(self, item: _ReviewItem, verdict: dict[str, Any]) -> QcIssue:
+        return QcIssue(
+            severity=QcSeverity(verdict["severity"]),
+            code="LLM_REVIEW",
+            message=verdict["message"] or "Flagged by LLM review",
+            locale=item.locale,
+            path=item.path,
+            source=item.source,
+            target=item.target,
+            details={"model": self.model},
+        )
@@ -0,0 +1,222 @@
+"""
+Deterministic QC rules.
+
+Every pattern is compiled once at import. Source segments are tokenised once
+(`extract_tokens`) and compared against each locale's target with `check_segment`.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from app.domain.content import SegmentPath, canonical_json, content_key
+from app.models.qc import QcIssue, QcSeverity
+
+# {name}, {{ name }}, ${name}, %s, %1$s, %(name)s
+PLACEHOLDER = re.compile(
+    r"\{\{\s*[\w.-]+\s*\}\}"
+    r"|\$\{[\w.-]+\}"
+    r"|\{[\w.-]+\}"
+    r"|%\([\w.-]+\)[sdif]"
+    r"|%(?:\d+\$)?[-+0#]*\d*(?:\.\d+)?[sdifuxXeEgGc@]"
+)
+# ICU arguments with a format: {count, plural, ...}, {when, date, short}
+ICU_ARGUMENT = re.compile(r"\{\s*(\w+)\s*,\s*(plural|selectordinal|select|number|date|time)\b")
+HTML_TAG = re.compile(r"<(/?)([a-zA-Z][\w:-]*)\b[^<>]*?(/?)>")
+# Digits with any grouping / decimal separators; compared without separators,
+# so "1,000.5" and "1.000,5" are the same number
+NUMBER = re.compile(r"\d+(?:[.,'\u00a0\u202f]\d+)*")
+_SEPARATORS = re.compile(r"\D")
+
+# Length checks only apply from this many source characters
+MIN_LENGTH_CHECK_CHARS = 20
+
+# (key path, source text) of each string segment
+Segments = list[tuple[str, str]]
+# Per locale: the segments to check and their targets, aligned
+LocaleSegments = dict[str, tuple[Segments, list[Any]]]
+# Per locale: {key path: hash of (source, target)}
+SegmentHashes = dict[str, dict[str, str]]
+
+
+@dataclass(frozen=True)
+class SegmentTokens:
+    """Sorted tokens of each kind, so equal multisets compare equal as plain tuples."""
+
+    placeholders: tuple[str, ...]
+    icu_arguments: tuple[str, ...]
+    tags: tuple[str, ...]
+    numbers: tuple[str, ...]
+
+
+def extract_tokens(text: str) -> SegmentTokens:
+    # Most segments have no markup at all: skip those scans on a substring test
+    placeholders = tuple(sorted(PLACEHOLDER.findall(text))) if "{" in text or "%" in text else ()
+    icu = tuple(sorted(f"{name}, {kind}" for name, kind in ICU_ARGUMENT.findall(text))) if "{" in text else ()
+    tags = (
+        tuple(sorted(f"{m.group(1)}{m.group(2).lower()}{m.group(3)}" for m in HTML_TAG.finditer(text)))
+        if "<" in text
+        else ()
+    )
+    # Digits inside placeholders and tags (%1$s, <h2>) are not numbers of the text
+    bare = HTML_TAG.sub(" ", PLACEHOLDER.sub(" ", text)) if placeholders or tags else text
+    numbers = tuple(sorted(_SEPARATORS.sub("", n) for n in NUMBER.findall(bare)))
+    return SegmentTokens(placeholders=placeholders, icu_arguments=icu, tags=tags, numbers=numbers)
+
+
+def json_path(path: SegmentPath) -> str:
+    """Key path as `$.a.b`; keys that are not identifiers are bracketed (`$["a.b"]`)."""
+    parts = ["$"]
+    for key in path:
+        parts.append(f".{key}" if key.isidentifier() else f'["{key}"]')
+    return "".join(parts)
+
+
+def segment_hashes(segments: Segments, targets: dict[str, list[Any]], checker: str = "") -> SegmentHashes:
+    """
+    Hash of (checker, source, target) per segment and locale; a change of any re-checks
+    the segment. `checker` names what checked it (e.g. the LLM model and prompt version).
+    """
+    return {
+        locale: {
+            path: content_key(canonical_json([checker, source, target]))[:16]
+            for (path, source), target in zip(segments, values)
+        }
+        for locale, values in targets.items()
+    }
+
+
+def _diff(expected_tokens: tuple[str, ...], found_tokens: tuple[str, ...]) -> dict[str, list[str]]:
+    expected, found = Counter(expected_tokens), Counter(found_tokens)
+    return {
+        "missing": sorted((expected - found).elements()),
+        "extra": sorted((found - expected).elements()),
+    }
+
+
+def check_segments(
+    segments: Segments,
+    locale: str,
+    targets: list[Any],
+    *,
+    tokens: list[SegmentTokens] | None = None,
+    min_length_ratio: float,
+    max_length_ratio: float,
+) -> list[QcIssue]:
+    """
+    Issues of one locale (or a chunk of it). `segments` are (key path, source text)
+    pairs aligned with `targets`; pass the sources' `tokens` when they are reused
+    across locales.
+    """
+    if tokens is None:
+        tokens = [extract_tokens(text) for _, text in segments]
+    issues: list[QcIssue] = []
+    for (path, text), source_tokens, target in zip(segments, tokens, targets):
+        issues += check_segment(
+            path,
+            locale,
+            text,
+            source_tokens,
+            target,
+            min_length_ratio=min_length_ratio,
+            max_length_ratio=max_length_ratio,
+        )
+    return issues
+
+
+def check_chunk(
+    segments: Segments,
+    locale: str,
+    targets: list[Any],
+    min_length_ratio: float,
+    max_length_ratio: float,
+) -> tuple[list[QcIssue], float]:
+    """Process pool task: `check_segments` of one chunk, and the CPU seconds it took."""
+    started = time.process_time()
+    issues = check_segments(
+        segments, locale, targets, min_length_ratio=min_length_ratio, max_length_ratio=max_length_ratio
+    )
+    return issues, time.process_time() - started
+
+
+def check_segment(
+    path: str,
+    locale: str,
+    source: str,
+    tokens: SegmentTokens,
+    target: Any,
+    *,
+    min_length_ratio: float,
+    max_length_ratio: float,
+) -> list[QcIssue]:
+    """Issues of one translated segment; `tokens` are the source's (see `extract_tokens`)."""
+
+    def issue(severity: QcSeverity, code: str, message: str, details: dict[str, Any] | None = None) -> QcIssue:
+        return QcIssue(
+            severity=severity,
+            code=code,
+            message=message,
+            locale=locale,
+            path=path,
+            source=source,
+            target=target if isinstance(target, str) else None,
+            details=details,
+        )
+
+    if not isinstance(target, str) or (source.strip() and not target.strip()):
+        return [issue(QcSeverity.ERROR, "MISSING_TRANSLATION", "Segment is not translated")]
+
+    issues: list[QcIssue] = []
+    found = extract_tokens(target)
+    if found.placeholders != tokens.placeholders:
+        issues.append(
+            issue(
+                QcSeverity.ERROR,
+                "PLACEHOLDER_MISMATCH",
+                "Placeholders differ from the source",
+                _diff(tokens.placeholders, found.placeholders),
+            )
+        )
+    if found.icu_arguments != tokens.icu_arguments:
+        issues.append(
+            issue(
+                QcSeverity.ERROR,
+                "ICU_MISMATCH",
+                "ICU arguments differ from the source",
+                _diff(tokens.icu_arguments, found.icu_arguments),
+            )
+        )
+    if found.tags != tokens.tags:
+        issues.append(
+            issue(QcSeverity.ERROR, "TAG_MISMATCH", "Markup tags differ from the source", _diff(tokens.tags, found.tags))
+        )
+    if found.numbers != tokens.numbers:
+        issues.append(
+            issue(
+                QcSeverity.WARNING,
+                "NUMBER_CHANGED",
+                "Numbers differ from the source",
+                _diff(tokens.numbers, found.numbers),
+            )
+        )
+
+    if (source[:1].isspace(), source[-1:].isspace()) != (target[:1].isspace(), target[-1:].isspace()):
+        issues.append(issue(QcSeverity.INFO, "WHITESPACE_MISMATCH", "Leading/trailing whitespace differs"))
+    elif "  " in target and "  " not in source:
+        issues.append(issue(QcSeverity.INFO, "WHITESPACE_MISMATCH", "Target contains repeated spaces"))
+
+    if len(source) >= MIN_LENGTH_CHECK_CHARS:
+        ratio = len(target) / len(source)
+        if not min_length_ratio <= ratio <= max_length_ratio:
+            issues.append(
+                issue(
+                    QcSeverity.WARNING,
+                    "LENGTH_RATIO",
+                    f"Target is {ratio:.1f}x the source length",
+                    {"ratio": round(ratio, 2)},
+                )
+            )
+    return issues
@@ -1,33 +1,262 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Any, Optional
 
-from app.models.qc import QcReport
+from app.core.config import Settings, get_settings
+from app.domain.content import SegmentPath, flatten_segments
+from app.models.qc import QcIssue, QcLocaleTiming, QcReport, QcSeverity
+from app.services.llm_qc import LlmQcService
+from app.services.qc_rules import (
+    LocaleSegments,
+    SegmentHashes,
+    Segments,
+    SegmentTokens,
+    check_chunk,
+    check_segments,
+    extract_tokens,
+    json_path,
+    segment_hashes,
+)
+
+logger = logging.getLogger(__name__)
+
+# Score penalty per issue, relative to the number of checked segments
+SEVERITY_WEIGHT = {QcSeverity.ERROR: 1.0, QcSeverity.WARNING: 0.25, QcSeverity.INFO: 0.0}
+_SEVERITY_ORDER = {QcSeverity.ERROR: 0, QcSeverity.WARNING: 1, QcSeverity.INFO: 2}
+
+
+@lru_cache
+def get_qc_executor() -> Optional[ProcessPoolExecutor]:
+    """Process-wide QC pool, or None when QC_WORKERS is 0 (QC runs in a thread)."""
+    workers = get_settings().QC_WORKERS
+    if workers == 0:
+        return None
+    # Workers are spawned, not forked, so they inherit no event loop or DB connections
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_qc_executor() -> None:
+    if get_qc_executor.cache_info().currsize:
+        executor = get_qc_executor()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        get_qc_executor.cache_clear()
 
 
 @dataclass
 class QCService:
     """Quality checks for localized content.
 
-    Clean seam to swap in:
-    - deterministic checks (placeholders/tags/numbers)
-    - LLM evaluation
-    - prompt/versioning and logging
+    Deterministic checks (placeholders, ICU arguments, tags, numbers, whitespace,
+    length; see app/services/qc_rules.py) over every string segment of every locale.
+    `run` checks in the calling thread; `run_parallel` fans locales and segment
+    chunks out to the QC process pool and then runs the LLM review, if given;
+    `run_incremental` does the same for the segments changed since the last report.
     """
 
-    model_name: str = "stub"
+    model_name: str | None = None
+    settings: Settings = field(default_factory=get_settings)
+    llm: Optional[LlmQcService] = None
 
     def run(self, *, source_content: dict, translated_content: dict) -> QcReport:
-        return self._run_stub(source_content=source_content, translated_content=translated_content)
+        return self._run_rules(source_content=source_content, translated_content=translated_content)
+
+    async def run_parallel(self, *, source_content: dict, translated_content: dict) -> QcReport:
+        """
+        One pool task per locale, or per QC_CHUNK_SEGMENTS segments of a locale. Results
+        are merged in locale and chunk order, so the rule issues equal those of `run`.
+        LLM issues follow the rule issues of the same severity.
+        """
+        # Flattening is CPU work too: keep it off the event loop
+        segments, targets = await asyncio.to_thread(self._align, source_content, translated_content)
+        work = {locale: (segments, values) for locale, values in targets.items()}
+        issues, timings, model, _ = await self._check_async(work)
+        return self._report(issues, len(segments) * len(targets), timings, model=model)
+
+    async def run_incremental(
+        self,
+        *,
+        source_content: dict,
+        translated_content: dict,
+        previous: Optional[QcReport],
+        previous_hashes: Optional[SegmentHashes],
+    ) -> tuple[QcReport, SegmentHashes]:
+        """
+        Checks only the segments whose source or target changed since `previous_hashes`
+        and merges their issues with the still-valid issues of `previous`. Without a
+        previous state, or when the previous report was truncated, everything is checked.
+        Returns the report and the segment hashes to store with it; segments the LLM
+        could not review get no hash, so the next run checks them again.
+        """
+        segments, targets = await asyncio.to_thread(self._align, source_content, translated_content)
+        # Enabling the LLM review, or changing its model or prompt, re-checks everything
+        checker = self.llm.version if self.llm is not None else ""
+        hashes = await asyncio.to_thread(segment_hashes, segments, targets, checker)
+        if previous is None or previous_hashes is None or previous.issue_count > len(previous.issues):
+            previous, previous_hashes = None, {}
+
+        work = {}
+        unchanged: dict[str, set[str]] = {}
+        for locale, values in targets.items():
+            old, new = previous_hashes.get(locale, {}), hashes[locale]
+            changed = [i for i, (path, _) in enumerate(segments) if old.get(path) != new[path]]
+            if changed:
+                work[locale] = ([segments[i] for i in changed], [values[i] for i in changed])
+            unchanged[locale] = set(new) - {segments[i][0] for i in changed}
+
+        issues, timings, model, unreviewed = await self._check_async(work)
+        for locale, paths in unreviewed.items():
+            for path in paths:
+                hashes[locale].pop(path, None)
+        if previous is not None:
+            # Issues of unchanged segments still hold; the rest were re-checked or are gone
+            issues = [
+                i for i in previous.issues if i.path is not None and i.path in unchanged.get(i.locale or "", ())
+            ] + issues
+        rechecked = sum(len(segs) for segs, _ in work.values())
+        logger.info("QC re-checked %d of %d segments", rechecked, len(segments) * len(targets))
+        report = self._report(issues, len(segments) * len(targets), timings, model=model, rechecked=rechecked)
+        return report, hashes
+
+    async def _check_async(
+        self, work: LocaleSegments
+    ) -> tuple[list[QcIssue], dict[str, QcLocaleTiming], str | None, dict[str, set[str]]]:
+        """
+        Rule checks in the pool (or a thread), then the LLM review.
+        Returns (issues, timings, model, paths per locale the LLM could not review).
+        """
+        executor = get_qc_executor()
+        if executor is None:
+            issues, timings = await asyncio.to_thread(self._check, work)
+        else:
+            issues, timings = await self._check_in_pool(executor, work)
+
+        if self.llm is None:
+            return issues, timings, self.model_name, {}
+        llm_issues, unreviewed = await self.llm.review(work)
+        return issues + llm_issues, timings, self.llm.model, unreviewed
+
+    async def _check_in_pool(
+        self, executor: ProcessPoolExecutor, work: LocaleSegments
+    ) -> tuple[list[QcIssue], dict[str, QcLocaleTiming]]:
+        loop = asyncio.get_running_loop()
+        size = self.settings.QC_CHUNK_SEGMENTS
+
+        async def run_locale(locale: str, segments: Segments, values: list[Any]) -> tuple[list[QcIssue], QcLocaleTiming]:
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor,
+                        partial(
+                            check_chunk,
+                            segments[i : i + size],
+                            locale,
+                            values[i : i + size],
+                            self.settings.QC_MIN_LENGTH_RATIO,
+                            self.settings.QC_MAX_LENGTH_RATIO,
+                        ),
+                    )
+                    for i in range(0, len(segments), size)
+                )
+            )
+            timing = QcLocaleTiming(
+                segments=len(segments),
+                chunks=len(results),
+                wall_ms=round((time.perf_counter() - started) * 1000, 1),
+                cpu_ms=round(sum(cpu for _, cpu in results) * 1000, 1),
+            )
+            return [issue for issues, _ in results for issue in issues], timing
+
+        per_locale = await asyncio.gather(
+            *(run_locale(locale, segments, values) for locale, (segments, values) in work.items())
+        )
+        issues = [issue for locale_issues, _ in per_locale for issue in locale_issues]
+        timings = {locale: timing for locale, (_, timing) in zip(work, per_locale)}
+        return issues, timings
+
+    def _run_rules(self, *, source_content: dict, translated_content: dict) -> QcReport:
+        """
+        Flattens the source once into aligned (path, text, tokens) arrays, then checks
+        each locale's flattened target against them. `translated_content` maps locale
+        to document.
+        """
+        segments, targets = self._align(source_content, translated_content)
+        issues, timings = self._check({locale: (segments, values) for locale, values in targets.items()})
+        return self._report(issues, len(segments) * len(targets), timings, model=self.model_name)
+
+    def _check(self, work: LocaleSegments) -> tuple[list[QcIssue], dict[str, QcLocaleTiming]]:
+        # Source tokens are shared by every locale checking that segment
+        tokens: dict[str, SegmentTokens] = {}
+
+        issues: list[QcIssue] = []
+        timings: dict[str, QcLocaleTiming] = {}
+        for locale, (segments, values) in work.items():
+            wall, cpu = time.perf_counter(), time.process_time()
+            for path, text in segments:
+                if path not in tokens:
+                    tokens[path] = extract_tokens(text)
+            issues += check_segments(
+                segments,
+                locale,
+                values,
+                tokens=[tokens[path] for path, _ in segments],
+                min_length_ratio=self.settings.QC_MIN_LENGTH_RATIO,
+                max_length_ratio=self.settings.QC_MAX_LENGTH_RATIO,
+            )
+            timings[locale] = QcLocaleTiming(
+                segments=len(segments),
+                wall_ms=round((time.perf_counter() - wall) * 1000, 1),
+                cpu_ms=round((time.process_time() - cpu) * 1000, 1),
+            )
+        return issues, timings
+
+    @staticmethod
+    def _align(source_content: dict, translated_content: dict) -> tuple[Segments, dict[str, list[Any]]]:
+        """(key path, source text) of every string segment, and each locale's targets in that order."""
+        source = flatten_segments(source_content)
+        paths: list[SegmentPath] = [path for path, text in source.items() if isinstance(text, str)]
+        segments = [(json_path(path), source[path]) for path in paths]
+        targets = {}
+        for locale, document in translated_content.items():
+            target = flatten_segments(document) if isinstance(document, dict) else {}
+            targets[locale] = [target.get(path) for path in paths]
+        return segments, targets
 
-    def _run_stub(self, *, source_content: dict, translated_content: dict) -> QcReport:
+    def _report(
+        self,
+        issues: list[QcIssue],
+        checked: int,
+        timings: dict[str, QcLocaleTiming],
+        *,
+        model: str | None,
+        rechecked: int | None = None,
+    ) -> QcReport:
+        penalty = sum(SEVERITY_WEIGHT[i.severity] for i in issues)
+        score = 100.0 if not checked else round(100 * max(0.0, 1 - penalty / checked), 1)
+        issues.sort(key=lambda i: _SEVERITY_ORDER[i.severity])
+        for locale, timing in timings.items():
+            logger.info(
+                "QC %s: %d segments in %d chunks, wall %.1f ms, cpu %.1f ms",
+                locale, timing.segments, timing.chunks, timing.wall_ms, timing.cpu_ms,
+            )
         return QcReport(
-            passed=True,
-            score=95,
-            issues=[],
-            model=self.model_name,
+            passed=not any(i.severity == QcSeverity.ERROR for i in issues),
+            score=score,
+            issues=issues[: self.settings.QC_MAX_ISSUES],
+            issue_count=len(issues),
+            model=model,
+            timings=timings,
+            rechecked_segments=checked if rechecked is None else rechecked,
         )
 
 
-def run_qc_stub(source_content: dict, translated_content: dict) -> QcReport:
+def run_qc(source_content: dict, translated_content: dict) -> QcReport:
     return QCService().run(source_content=source_content, translated_content=translated_content)
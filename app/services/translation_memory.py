@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.domain.content import build_document, flatten_segments, merge_documents, text_hash
+from app.domain.job import JobTmView
+from app.domain.translation_memory import TmPrefill, TmStats
+from app.repos.job_locale_content import get_locale_contents
+from app.repos.translation_memory import get_memory_stats, lookup_translations, upsert_translations
+
+
+class TranslationMemoryService:
+    """
+    Exact-match translation memory over content segments (string leaves, by key path),
+    keyed by (SHA-256 of the source string, source locale, target locale).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.settings = get_settings()
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.TRANSLATION_MEMORY_ENABLED
+
+    async def prefill(self, source_locale: str, target_locales: list[str], content: dict[str, Any]) -> TmPrefill:
+        """
+        Looks up every string segment for every target locale in one query. Numbers and
+        booleans are copied as they are; other leaves (arrays, nulls) always go to the TMS.
+        """
+        leaves = flatten_segments(content)
+        texts = {p: v for p, v in leaves.items() if isinstance(v, str)}
+        copied = {p: v for p, v in leaves.items() if isinstance(v, (bool, int, float))}
+        untranslatable = len(leaves) - len(texts) - len(copied)
+
+        hashes = {p: text_hash(t) for p, t in texts.items()}
+        known = await lookup_translations(
+            self.db,
+            source_locale=source_locale,
+            target_locales=target_locales,
+            source_hashes=set(hashes.values()),
+        )
+
+        matches = {
+            locale: {p: known[(h, locale)] for p, h in hashes.items() if (h, locale) in known}
+            for locale in target_locales
+        }
+        segments = len(texts) * len(target_locales)
+        hits = sum(len(found) for found in matches.values())
+        complete = not untranslatable and hits == segments
+        documents = {
+            locale: build_document({**copied, **found})
+            for locale, found in matches.items()
+            if found or complete
+        }
+        return TmPrefill(documents=documents, segments=segments, hits=hits, complete=complete)
+
+    async def pending_content(
+        self, job_id, content: dict[str, Any], target_locales: Iterable[str]
+    ) -> dict[str, Any]:
+        """The part of `content` still missing from at least one target locale."""
+        stored = await get_locale_contents(self.db, job_id, target_locales)
+        present = [set(flatten_segments(stored.get(locale, {}))) for locale in target_locales]
+        return build_document(
+            {p: v for p, v in flatten_segments(content).items() if any(p not in have for have in present)}
+        )
+
+    async def complete(
+        self,
+        job: JobTmView,
+        source_content: dict[str, Any] | None,
+        translations: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Final per-locale documents for a completed job: the TMS translations merged over
+        pre-filled segments. Learns the TMS translations when `source_content` is given.
+        """
+        if source_content is not None:
+            await self.learn(job, source_content, translations)
+        if not job.tm_hits:
+            return translations
+        stored = await get_locale_contents(self.db, job.id, translations.keys())
+        return {
+            locale: merge_documents(stored[locale], doc) if locale in stored else doc
+            for locale, doc in translations.items()
+        }
+
+    async def learn(self, job: JobTmView, source_content: dict[str, Any], translations: dict[str, Any]) -> None:
+        source = {p: v for p, v in flatten_segments(source_content).items() if isinstance(v, str)}
+        hashes = {p: text_hash(t) for p, t in source.items()}
+        rows = []
+        for locale, document in translations.items():
+            target = flatten_segments(document)
+            for path, source_hash in hashes.items():
+                text = target.get(path)
+                if isinstance(text, str) and text:
+                    rows.append(
+                        {
+                            "source_hash": source_hash,
+                            "source_locale": job.source_locale,
+                            "target_locale": locale,
+                            "target_text": text,
+                            "job_id": job.id,
+                        }
+                    )
+        await upsert_translations(self.db, rows)
+
+    async def stats(self, since: datetime | None = None) -> TmStats:
+        jobs, segments, hits = await get_memory_stats(self.db, since=since)
+        return TmStats(jobs=jobs, segments=segments, hits=hits)
@@ -0,0 +1,54 @@
+"""
+Lease heartbeats for workers that claim rows for the duration of slow work.
+
+A claim is a lease that expires unless renewed, so a crashed worker's rows become
+claimable again. `run_with_lease` renews the lease while the work runs, and stops
+the work if the lease was lost to another worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def _heartbeat(renew: Callable[[], Awaitable[bool]], interval: float, name: str) -> None:
+    """Renews the lease every `interval` seconds until cancelled; returns if it was lost."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            renewed = await renew()
+        except Exception:
+            # The lease still covers a few missed beats
+            logger.exception("Lease renewal for %s failed", name)
+            continue
+        if not renewed:
+            logger.warning("Lease on %s was lost", name)
+            return
+
+
+async def run_with_lease(
+    work: Awaitable[None],
+    renew: Callable[[], Awaitable[bool]],
+    *,
+    interval: float,
+    name: str,
+) -> None:
+    """
+    Awaits `work` while calling `renew` every `interval` seconds. `renew` extends the
+    lease in its own transaction and returns False once the claim is no longer ours;
+    the work is then cancelled, as another worker owns the row. Errors of `work` are
+    logged, not raised.
+    """
+    task = asyncio.ensure_future(work)
+    heartbeat = asyncio.create_task(_heartbeat(renew, interval, name))
+    try:
+        await asyncio.wait({task, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for t in (task, heartbeat):
+            t.cancel()
+        result, _ = await asyncio.gather(task, heartbeat, return_exceptions=True)
+    if isinstance(result, Exception):
+        logger.error("%s crashed", name, exc_info=result)
@@ -0,0 +1,103 @@
+"""
+QC worker: claims `translated` jobs (moving them to `qc_running`), runs QC and
+writes the report and `done` in one transaction.
+
+Claims are leases on the job row (`qc_lease_expires_at`), renewed every
+QC_HEARTBEAT_SECONDS while QC runs. Any number of workers can run on any number
+of nodes: claims skip rows locked by other workers, and a job whose worker died
+is re-claimed once its lease expires. Each claim bumps `qc_attempts` and draws a
+new `qc_lease_id`; a worker only writes while the lease id is still its own, so
+a job re-translated mid-run (back to `translated`) voids the running claim.
+
+Run standalone with `python -m app.workers.qc_worker`, or in the API process by
+setting QC_QUEUE_IN_PROCESS=true.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from app.clients.llm.factory import close_llm_client
+from app.core.config import get_settings
+from app.db.database import AsyncSessionLocal, async_engine
+from app.domain.job import QcClaim
+from app.repos.jobs import claim_qc_jobs, renew_qc_lease
+from app.services.job_service import JobService
+from app.services.qc_service import shutdown_qc_executor
+from app.workers.lease import run_with_lease
+
+logger = logging.getLogger(__name__)
+
+
+async def _process(claim: QcClaim) -> None:
+    settings = get_settings()
+
+    async def run() -> None:
+        async with AsyncSessionLocal() as db:
+            await JobService(db).process_qc(claim)
+
+    async def renew() -> bool:
+        async with AsyncSessionLocal() as db:
+            renewed = await renew_qc_lease(db, claim, lease_seconds=settings.QC_LEASE_SECONDS)
+            await db.commit()
+            return renewed
+
+    await run_with_lease(
+        run(),
+        renew,
+        interval=settings.QC_HEARTBEAT_SECONDS,
+        name=f"QC of job {claim.job_id} (attempt {claim.attempts})",
+    )
+
+
+async def drain_once() -> int:
+    """Claims one batch of jobs and waits for their QC. Returns the batch size."""
+    settings = get_settings()
+
+    async with AsyncSessionLocal() as db:
+        claimed = await claim_qc_jobs(db, limit=settings.QC_QUEUE_CONCURRENCY, lease_seconds=settings.QC_LEASE_SECONDS)
+        await db.commit()
+
+    await asyncio.gather(*(_process(c) for c in claimed))
+    return len(claimed)
+
+
+async def run_forever(stop: asyncio.Event) -> None:
+    settings = get_settings()
+    while not stop.is_set():
+        try:
+            claimed = await drain_once()
+        except Exception:
+            logger.exception("QC queue poll failed")
+            claimed = 0
+        if not claimed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), settings.QC_QUEUE_POLL_INTERVAL)
+
+
+def start_in_background() -> tuple[asyncio.Task, asyncio.Event]:
+    """Runs the QC worker on the current event loop (API process)."""
+    stop = asyncio.Event()
+    task = asyncio.create_task(run_forever(stop), name="qc-worker")
+    return task, stop
+
+
+async def _main() -> None:
+    stop = asyncio.Event()
+    try:
+        await run_forever(stop)
+    finally:
+        shutdown_qc_executor()
+        await close_llm_client()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
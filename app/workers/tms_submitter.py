@@ -0,0 +1,102 @@
+"""
+Drains the TMS outbox: claims due submissions and pushes them to the TMS
+with at most TMS_SUBMIT_CONCURRENCY requests in flight.
+
+A claim is a lease of TMS_OUTBOX_LEASE_SECONDS, renewed every
+TMS_OUTBOX_HEARTBEAT_SECONDS while the submission (with its retries and chunks)
+runs, so slow submissions are not claimed and sent twice.
+
+Run standalone with `python -m app.workers.tms_submitter`, or in the API
+process by setting TMS_OUTBOX_IN_PROCESS=true.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from app.clients.tms.factory import close_tms_client
+from app.core.config import get_settings
+from app.db.database import AsyncSessionLocal, async_engine
+from app.domain.tms_outbox import TmsSubmission
+from app.repos.tms_outbox import claim_due_submissions, renew_submission_lease
+from app.services.job_service import JobService
+from app.workers.lease import run_with_lease
+
+logger = logging.getLogger(__name__)
+
+
+async def _submit(submission: TmsSubmission) -> None:
+    settings = get_settings()
+
+    async def submit() -> None:
+        async with AsyncSessionLocal() as db:
+            await JobService(db).submit_to_tms(submission)
+
+    async def renew() -> bool:
+        async with AsyncSessionLocal() as db:
+            renewed = await renew_submission_lease(db, submission, lease_seconds=settings.TMS_OUTBOX_LEASE_SECONDS)
+            await db.commit()
+            return renewed
+
+    await run_with_lease(
+        submit(),
+        renew,
+        interval=settings.TMS_OUTBOX_HEARTBEAT_SECONDS,
+        name=f"TMS submission {submission.id} for job {submission.job_id}",
+    )
+
+
+async def drain_once() -> int:
+    """Claims one batch of due submissions and waits for them. Returns the batch size."""
+    settings = get_settings()
+
+    async with AsyncSessionLocal() as db:
+        claimed = await claim_due_submissions(
+            db,
+            limit=settings.TMS_SUBMIT_CONCURRENCY,
+            lease_seconds=settings.TMS_OUTBOX_LEASE_SECONDS,
+        )
+        await db.commit()
+
+    await asyncio.gather(*(_submit(s) for s in claimed))
+    return len(claimed)
+
+
+async def run_forever(stop: asyncio.Event) -> None:
+    settings = get_settings()
+    while not stop.is_set():
+        try:
+            claimed = await drain_once()
+        except Exception:
+            logger.exception("TMS outbox poll failed")
+            claimed = 0
+        if not claimed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), settings.TMS_OUTBOX_POLL_INTERVAL)
+
+
+def start_in_background() -> tuple[asyncio.Task, asyncio.Event]:
+    """Runs the submitter on the current event loop (API process)."""
+    stop = asyncio.Event()
+    task = asyncio.create_task(run_forever(stop), name="tms-submitter")
+    return task, stop
+
+
+async def _main() -> None:
+    stop = asyncio.Event()
+    try:
+        await run_forever(stop)
+    finally:
+        await close_tms_client()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Applies webhook events queued in queue mode (WEBHOOK_MODE=queue).
+
+Events are sharded by internal_job_id. Each of the WEBHOOK_QUEUE_WORKERS tasks
+owns the shards `s` with `s % WEBHOOK_QUEUE_WORKERS == task_index`, and a shard
+is only drained under a Postgres advisory lock, so events of one job apply in
+arrival order while different jobs apply in parallel, across any number of nodes.
+
+Run standalone with `python -m app.workers.webhook_consumer`, or in the API
+process by setting WEBHOOK_QUEUE_IN_PROCESS=true.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from app.clients.tms.factory import close_tms_client
+from app.core.config import get_settings
+from app.db.database import AsyncSessionLocal, async_engine
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+async def drain_shard(shard: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return await JobService(db).consume_webhook_shard(shard)
+
+
+async def run_shard_worker(index: int, stop: asyncio.Event) -> None:
+    settings = get_settings()
+    shards = range(index, settings.WEBHOOK_QUEUE_SHARDS, settings.WEBHOOK_QUEUE_WORKERS)
+
+    while not stop.is_set():
+        applied = 0
+        for shard in shards:
+            try:
+                applied += await drain_shard(shard)
+            except Exception:
+                logger.exception("Webhook shard %d failed", shard)
+        if not applied:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), settings.WEBHOOK_QUEUE_POLL_INTERVAL)
+
+
+async def run_forever(stop: asyncio.Event) -> None:
+    settings = get_settings()
+    await asyncio.gather(
+        *(run_shard_worker(i, stop) for i in range(settings.WEBHOOK_QUEUE_WORKERS))
+    )
+
+
+def start_in_background() -> tuple[asyncio.Task, asyncio.Event]:
+    """Runs the consumers on the current event loop (API process)."""
+    stop = asyncio.Event()
+    task = asyncio.create_task(run_forever(stop), name="webhook-consumer")
+    return task, stop
+
+
+async def _main() -> None:
+    stop = asyncio.Event()
+    try:
+        await run_forever(stop)
+    finally:
+        await close_tms_client()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
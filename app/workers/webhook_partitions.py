@@ -0,0 +1,187 @@
+"""
+Partition maintenance for `webhook_events`.
+
+Creates the partitions for the next WEBHOOK_EVENTS_PARTITIONS_AHEAD intervals and
+drops partitions that ended more than WEBHOOK_EVENTS_RETENTION_DAYS ago, so old
+events disappear with a DROP TABLE instead of bulk DELETEs.
+
+A DEFAULT partition catches events no range partition covers (maintenance did
+not run for longer than WEBHOOK_EVENTS_PARTITIONS_AHEAD intervals), so webhook
+ingest never fails for lack of a partition. Maintenance warns while it holds rows
+and moves them into their range partition once that is created.
+
+Run daily with `python -m app.workers.webhook_partitions`; the API also ensures
+upcoming partitions on startup (best effort). A `webhook_events` table from before
+partitioning has to be converted first (see docs/ARCHITECTURE.md); until then
+maintenance refuses to run.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import get_settings
+from app.db.database import async_engine
+from app.db.models.webhook_event import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT = WebhookEvent.__tablename__
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+# Serialises concurrent maintenance runs (e.g. several API processes starting)
+MAINTENANCE_LOCK = (0x5057, 1)  # "PW"
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def interval_start(day: date, interval: str) -> date:
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def interval_length(interval: str) -> timedelta:
+    return timedelta(weeks=1) if interval == "week" else timedelta(days=1)
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+async def _lock(conn: AsyncConnection) -> None:
+    await conn.execute(select(func.pg_advisory_xact_lock(*MAINTENANCE_LOCK)))
+
+
+async def require_partitioned(conn: AsyncConnection) -> None:
+    """Raises if webhook_events is still the plain table of older deployments."""
+    partitioned = await conn.scalar(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:parent AS regclass)"), {"parent": PARENT}
+    )
+    if not partitioned:
+        raise RuntimeError(
+            f"{PARENT} is not partitioned; convert it as described in docs/ARCHITECTURE.md "
+            "(event-level idempotency) before running partition maintenance"
+        )
+
+
+async def create_partitions(conn: AsyncConnection, today: date) -> list[str]:
+    settings = get_settings()
+    interval = settings.WEBHOOK_EVENTS_PARTITION_INTERVAL
+    step = interval_length(interval)
+    start = interval_start(today, interval)
+
+    await conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" PARTITION OF "{PARENT}" DEFAULT'))
+    existing = {name for name, _ in await list_partitions(conn)}
+    created = []
+    for _ in range(settings.WEBHOOK_EVENTS_PARTITIONS_AHEAD + 1):
+        name = f"{PARENT}_p{start:%Y%m%d}"
+        if name not in existing:
+            await _create_partition(conn, name, _utc(start), _utc(start + step))
+            created.append(name)
+        start += step
+    return created
+
+
+async def _create_partition(conn: AsyncConnection, name: str, lower: datetime, upper: datetime) -> None:
+    """
+    Creates a range partition. Rows the DEFAULT partition holds for that range would
+    make the CREATE fail, so they are moved out first and re-inserted through the parent.
+    """
+    in_range = {"lower": lower, "upper": upper}
+    held = await conn.scalar(
+        text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}" WHERE received_at >= :lower AND received_at < :upper'),
+        in_range,
+    )
+    if held:
+        await conn.execute(text(f'CREATE TEMPORARY TABLE _moved_events (LIKE "{PARENT}") ON COMMIT DROP'))
+        await conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                "WHERE received_at >= :lower AND received_at < :upper RETURNING *) "
+                "INSERT INTO _moved_events SELECT * FROM moved"
+            ),
+            in_range,
+        )
+    await conn.execute(text(
+        f'CREATE TABLE "{name}" PARTITION OF "{PARENT}" '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
+    if held:
+        await conn.execute(text(f'INSERT INTO "{PARENT}" SELECT * FROM _moved_events'))
+        await conn.execute(text("DROP TABLE _moved_events"))
+        logger.warning("Moved %d webhook events from %s into %s", held, DEFAULT_PARTITION, name)
+
+
+async def check_default_partition(conn: AsyncConnection) -> int:
+    """Rows in the DEFAULT partition; any means partition maintenance fell behind."""
+    held = await conn.scalar(text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"'))
+    if held:
+        logger.warning(
+            "%d webhook events are in %s: partition maintenance is behind; "
+            "they are kept past WEBHOOK_EVENTS_RETENTION_DAYS until their partition exists",
+            held,
+            DEFAULT_PARTITION,
+        )
+    return held
+
+
+async def drop_expired_partitions(conn: AsyncConnection, now: datetime) -> list[str]:
+    cutoff = now - timedelta(days=get_settings().WEBHOOK_EVENTS_RETENTION_DAYS)
+    dropped = []
+    for name, upper in await list_partitions(conn):
+        if upper <= cutoff:
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    return dropped
+
+
+async def list_partitions(conn: AsyncConnection) -> list[tuple[str, datetime]]:
+    """(partition name, exclusive upper bound) for each partition of webhook_events."""
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    )
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound or "")
+        if match:
+            partitions.append((name, datetime.fromisoformat(match.group(2))))
+    return partitions
+
+
+async def ensure_partitions(*, drop_expired: bool = False) -> None:
+    now = datetime.now(timezone.utc)
+    async with async_engine.begin() as conn:
+        await _lock(conn)
+        await require_partitioned(conn)
+        created = await create_partitions(conn, now.date())
+        dropped = await drop_expired_partitions(conn, now) if drop_expired else []
+        await check_default_partition(conn)
+    if created or dropped:
+        logger.info("webhook_events partitions created=%s dropped=%s", created, dropped)
+
+
+async def _main() -> None:
+    try:
+        await ensure_partitions(drop_expired=True)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()